@@ -1,57 +1,82 @@
-from typing import Generator, Optional
+import hashlib
+import threading
+import time
+from typing import Dict, Generator, Optional, Tuple
 
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 
-from app.core.config import settings
 from app.core.database import get_db
+from app.core.security import verify_token
 from app.models.models import User as UserModel
 from app.services.user_service import get_user_by_email
 
 security = HTTPBearer()
 
+# Access-token digest -> user id for recently authenticated tokens, so a request
+# carrying a known token skips verification and the email lookup, leaving only a
+# primary-key get (an identity-map hit once loaded in the session). The row itself
+# is still loaded per request: handlers update it through the request's session.
+USER_ID_CACHE_TTL = 60  # seconds
+USER_ID_CACHE_MAX_SIZE = 10_000
+_user_id_cache: Dict[bytes, Tuple[int, float]] = {}  # token digest -> (user id, monotonic deadline)
+_user_id_cache_lock = threading.Lock()
 
-def get_current_user_from_cookie(
-    request: Request, 
+
+def _get_user_for_token(db: Session, token: str) -> Optional[UserModel]:
+    key = hashlib.blake2b(token.encode(), digest_size=16).digest()
+    with _user_id_cache_lock:
+        cached = _user_id_cache.get(key)
+    if cached is not None and time.monotonic() < cached[1]:
+        user = db.get(UserModel, cached[0])
+        if user is not None:
+            return user
+    
+    payload = verify_token(token)
+    if not payload or not payload.get("sub"):
+        return None
+    user = get_user_by_email(db, payload["sub"])
+    if user is not None:
+        # Never keep serving a token past its own expiry
+        remaining = payload.get("exp", 0) - time.time()
+        deadline = time.monotonic() + min(USER_ID_CACHE_TTL, remaining)
+        with _user_id_cache_lock:
+            if len(_user_id_cache) >= USER_ID_CACHE_MAX_SIZE:
+                _user_id_cache.pop(next(iter(_user_id_cache)))  # Drop the oldest entry
+            _user_id_cache[key] = (user.id, deadline)
+    return user
+
+
+def get_optional_user_from_cookie(
+    request: Request,
     db: Session = Depends(get_db)
-) -> UserModel:
-    """Get current user from cookie-based authentication"""
+) -> Optional[UserModel]:
+    """Get the user behind the access_token cookie, or None if not signed in.
+
+    Page and dashboard routes use this to pick their own failure response
+    (redirect or JSON error); FastAPI caches it per request, so handlers that
+    also depend on get_current_user_from_cookie only resolve the user once.
+    """
     token = request.cookies.get("access_token")
     if not token:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="Not authenticated"
-        )
+        return None
     
     # Handle both "Bearer token" and "token" formats
     if token.startswith("Bearer "):
         token = token[7:]  # Remove "Bearer " prefix
     
-    try:
-        payload = jwt.decode(
-            token, 
-            settings.SECRET_KEY, 
-            algorithms=["HS256"]
-        )
-        email = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, 
-                detail="Invalid token"
-            )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="Invalid token"
-        )
-    
-    user = db.query(UserModel).filter(UserModel.email == email).first()
+    return _get_user_for_token(db, token)
+
+
+def get_current_user_from_cookie(
+    user: Optional[UserModel] = Depends(get_optional_user_from_cookie)
+) -> UserModel:
+    """Get current user from cookie-based authentication"""
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="User not found"
+            detail="Not authenticated"
         )
     return user
 
@@ -61,29 +86,11 @@ def get_current_user_from_token(
     db: Session = Depends(get_db)
 ) -> UserModel:
     """Get current user from Bearer token authentication"""
-    try:
-        payload = jwt.decode(
-            credentials.credentials, 
-            settings.SECRET_KEY, 
-            algorithms=["HS256"]
-        )
-        email = payload.get("sub")
-        if email is None:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED, 
-                detail="Invalid token"
-            )
-    except JWTError:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="Invalid token"
-        )
-    
-    user = db.query(UserModel).filter(UserModel.email == email).first()
+    user = _get_user_for_token(db, credentials.credentials)
     if user is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED, 
-            detail="User not found"
+            detail="Invalid token"
         )
     return user
 
@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Request
-from fastapi.templating import Jinja2Templates
+
+from app.core.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 @router.get("/public-booking-test")
 def public_booking_test(request: Request):
@@ -2,17 +2,19 @@ from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import Dict, Any
 import json
+from datetime import datetime, date
 
 from app.core.database import get_db
 from app.services.intelligent_agent_service import IntelligentAgentService
 from app.services.google_calendar_service import GoogleCalendarService
 from app.api.deps import get_current_user_from_cookie
 from app.models.models import User
+from app.services import availability_service, booking_service
 
 router = APIRouter()
 
 @router.get("/knowledge")
-async def get_knowledge(
+def get_knowledge(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie)
 ):
@@ -27,7 +29,7 @@ async def get_knowledge(
         raise HTTPException(status_code=500, detail=f"Error getting knowledge: {str(e)}")
 
 @router.get("/calendar/events")
-async def get_calendar_events(
+def get_calendar_events(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie)
 ):
@@ -51,7 +53,7 @@ async def get_calendar_events(
         return {"events": []}
 
 @router.get("/stats")
-async def get_user_stats_endpoint(
+def get_user_stats_endpoint(
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user_from_cookie)
 ):
@@ -73,10 +75,6 @@ def get_user_stats(db: Session, user_id: int) -> Dict[str, Any]:
     Get user statistics for the dashboard
     """
     try:
-        from app.services import availability_service
-        from app.services import booking_service
-        from datetime import datetime, date
-        
         # Get available slots count
         available_slots = availability_service.get_available_slots_for_booking(db, user_id)
         available_slots_count = len(available_slots)
@@ -1,8 +1,10 @@
 from datetime import timedelta
 from typing import Any
-from datetime import datetime
-import requests
+from datetime import datetime, timezone
+import asyncio
+import logging
 import secrets
+from urllib.parse import urlencode
 
 from fastapi import APIRouter, Depends, HTTPException, Query, Request, Form
 from fastapi.responses import RedirectResponse
@@ -11,11 +13,47 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.database import get_db
-from app.core.security import create_access_token, verify_token
+from app.api.deps import get_current_user_from_cookie
+from app.core.security import create_access_token
+from app.models.models import PendingCalendarConnection, User
 from app.schemas.schemas import UserCreate
+from app.services.oauth_service import get_oauth_service
+from app.services.sync.background_sync import background_sync_service
 from app.services.user_service import authenticate_user, create_user, get_user_by_email
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+PENDING_CALENDAR_CONNECTION_TTL = 600  # seconds a calendar OAuth handoff stays claimable
+
+GOOGLE_OAUTH_SCOPES = (
+    "openid email profile https://www.googleapis.com/auth/calendar https://www.googleapis.com/auth/calendar.events "
+    "https://www.googleapis.com/auth/calendar.readonly https://www.googleapis.com/auth/gmail.send"
+)
+
+# Either grant lets us create booking events; a readonly grant or an unrelated
+# scope that merely contains "calendar" is not enough
+CALENDAR_WRITE_SCOPES = frozenset({
+    "https://www.googleapis.com/auth/calendar",
+    "https://www.googleapis.com/auth/calendar.events",
+})
+
+
+def _google_auth_url(state: str) -> str:
+    return "https://accounts.google.com/o/oauth2/v2/auth?" + urlencode({
+        "client_id": settings.GOOGLE_CLIENT_ID,
+        "response_type": "code",
+        "scope": GOOGLE_OAUTH_SCOPES,
+        "redirect_uri": settings.GOOGLE_REDIRECT_URI,
+        "access_type": "offline",
+        "prompt": "consent",
+        "state": state,
+    })
+
+
+# Settings don't change at runtime, so the OAuth redirect URLs are built once
+SIGNUP_AUTH_URL = _google_auth_url("signup")
+CALENDAR_AUTH_URL = _google_auth_url("calendar_connection")
 
 
 @router.post("/login/access-token", response_model=dict)
@@ -36,18 +74,7 @@ async def google_auth():
     if not settings.GOOGLE_CLIENT_ID:
         raise HTTPException(status_code=500, detail="Google OAuth not configured")
     
-    google_auth_url = (
-        "https://accounts.google.com/o/oauth2/v2/auth?"
-        f"client_id={settings.GOOGLE_CLIENT_ID}&"
-        "response_type=code&"
-        "scope=openid email profile https://www.googleapis.com/auth/calendar https://www.googleapis.com/auth/calendar.events https://www.googleapis.com/auth/calendar.readonly https://www.googleapis.com/auth/gmail.send&"
-        f"redirect_uri={settings.GOOGLE_REDIRECT_URI}&"
-        "access_type=offline&"
-        "prompt=consent&"
-        "state=signup"
-    )
-    
-    return RedirectResponse(url=google_auth_url)
+    return RedirectResponse(url=SIGNUP_AUTH_URL)
 
 
 @router.get("/google/calendar")
@@ -56,18 +83,7 @@ async def google_calendar_auth():
     if not settings.GOOGLE_CLIENT_ID:
         raise HTTPException(status_code=500, detail="Google OAuth not configured")
     
-    google_auth_url = (
-        "https://accounts.google.com/o/oauth2/v2/auth?"
-        f"client_id={settings.GOOGLE_CLIENT_ID}&"
-        "response_type=code&"
-        "scope=openid email profile https://www.googleapis.com/auth/calendar https://www.googleapis.com/auth/calendar.events https://www.googleapis.com/auth/calendar.readonly https://www.googleapis.com/auth/gmail.send&"
-        f"redirect_uri={settings.GOOGLE_REDIRECT_URI}&"
-        "access_type=offline&"
-        "prompt=consent&"
-        "state=calendar_connection"
-    )
-    
-    return RedirectResponse(url=google_auth_url)
+    return RedirectResponse(url=CALENDAR_AUTH_URL)
 
 
 @router.get("/google/callback")
@@ -80,31 +96,19 @@ async def google_auth_callback(
     is_calendar_connection = state == "calendar_connection"
     
     try:
-        token_url = "https://oauth2.googleapis.com/token"
-        token_data = {
-            "code": code,
-            "client_id": settings.GOOGLE_CLIENT_ID,
-            "client_secret": settings.GOOGLE_CLIENT_SECRET,
-            "redirect_uri": settings.GOOGLE_REDIRECT_URI,
-            "grant_type": "authorization_code",
-        }
-        headers = {"Content-Type": "application/x-www-form-urlencoded"}
-        
-        token_response = requests.post(token_url, data=token_data, headers=headers)
-        token_response.raise_for_status()
-        tokens = token_response.json()
-        access_token = tokens.get("access_token")
-        refresh_token = tokens.get("refresh_token")
-        scope = tokens.get("scope", "")
+        # The token exchange and user info lookups are blocking HTTP calls; run them
+        # in a worker thread over pooled connections so the event loop stays free
+        oauth_service = get_oauth_service()
+        tokens = await asyncio.to_thread(oauth_service.exchange_code_for_tokens, code)
+        access_token = tokens["access_token"]
+        refresh_token = tokens["refresh_token"]
+        scope = tokens["scope"]
         
         if not access_token:
             raise Exception("No access token in response")
         
         # Get user info from Google
-        user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
-        user_response = requests.get(user_info_url, headers={"Authorization": f"Bearer {access_token}"})
-        user_response.raise_for_status()
-        user_info = user_response.json()
+        user_info = await asyncio.to_thread(oauth_service.get_user_info, access_token)
         
         # Check if user exists
         user = get_user_by_email(db, user_info["email"])
@@ -115,24 +119,29 @@ async def google_auth_callback(
             calendar_name = user_info.get("name")
             
             # Check if calendar scope is present
-            if "calendar" not in scope.lower():
+            if CALENDAR_WRITE_SCOPES.isdisjoint(scope.split()):
                 return RedirectResponse(url="/dashboard?calendar_error=no_calendar_scope", status_code=302)
             
             # Store calendar tokens temporarily with a unique identifier
             connection_id = secrets.token_urlsafe(32)
             
-            # Store temporarily in a simple dict (in production, use Redis or database)
-            if not hasattr(router.state, 'pending_calendar_connections'):
-                router.state.pending_calendar_connections = {}
-            
-            router.state.pending_calendar_connections[connection_id] = {
-                'calendar_email': calendar_email,
-                'calendar_name': calendar_name,
-                'access_token': access_token,
-                'refresh_token': refresh_token,
-                'created_at': datetime.now(),
-                'scope': scope
-            }
+            # Stage the tokens in the database rather than process memory, so whichever
+            # worker serves the completion request can claim them; expired handoffs
+            # are purged in the same transaction
+            now = datetime.now(timezone.utc)
+            db.query(PendingCalendarConnection).filter(
+                PendingCalendarConnection.expires_at <= now
+            ).delete(synchronize_session=False)
+            db.add(PendingCalendarConnection(
+                id=connection_id,
+                calendar_email=calendar_email,
+                calendar_name=calendar_name,
+                access_token=access_token,
+                refresh_token=refresh_token,
+                scope=scope,
+                expires_at=now + timedelta(seconds=PENDING_CALENDAR_CONNECTION_TTL)
+            ))
+            db.commit()
             
             # Redirect to agent dashboard with connection ID
             return RedirectResponse(url=f"/dashboard?calendar_connection_id={connection_id}", status_code=302)
@@ -147,7 +156,7 @@ async def google_auth_callback(
                     full_name=user_info.get("name", ""),
                     google_id=user_info["id"]
                 )
-                user = create_user(db, user_data)
+                user = await create_user(db, user_data)
             else:
                 # Update existing user's Google ID and full name if not set
                 updated = False
@@ -166,7 +175,10 @@ async def google_auth_callback(
                 user.google_refresh_token = refresh_token
             user.google_calendar_connected = True
             user.google_calendar_email = user.email
+            user.google_calendar_sync_token = None  # Force a full sync for the connected calendar
             db.commit()
+            # Pull the newly connected calendar now rather than at the next scheduled cycle
+            background_sync_service.trigger_now()
             
             # Create access token for our app
             jwt_token = create_access_token(data={"sub": user.email})
@@ -189,45 +201,42 @@ async def google_auth_callback(
 
 
 @router.post("/calendar/connect")
-async def complete_calendar_connection(
+def complete_calendar_connection(
     request: Request, 
     connection_id: str = Form(...), 
+    user: User = Depends(get_current_user_from_cookie),
     db: Session = Depends(get_db)
 ):
     """Complete the calendar connection process"""
-    access_token = request.cookies.get("access_token")
-    if not access_token:
-        raise HTTPException(status_code=401, detail="Not authenticated")
-    
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            raise HTTPException(status_code=401, detail="Invalid token")
-        
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-        if not user:
-            raise HTTPException(status_code=401, detail="User not found")
-        
         # Get the pending calendar connection
-        if not hasattr(router.state, 'pending_calendar_connections'):
-            raise HTTPException(status_code=404, detail="Calendar connection not found")
-        
-        connection_data = router.state.pending_calendar_connections.get(connection_id)
+        connection_data = db.query(PendingCalendarConnection).filter(
+            PendingCalendarConnection.id == connection_id,
+            PendingCalendarConnection.expires_at > datetime.now(timezone.utc)
+        ).first()
         if not connection_data:
             raise HTTPException(status_code=404, detail="Calendar connection not found or expired")
+        calendar_email = connection_data.calendar_email
         
         # Update user with calendar credentials
-        user.google_access_token = connection_data['access_token']
-        user.google_refresh_token = connection_data['refresh_token']
+        user.google_access_token = connection_data.access_token
+        user.google_refresh_token = connection_data.refresh_token
         user.google_calendar_connected = True
-        user.google_calendar_email = connection_data['calendar_email']
+        user.google_calendar_email = calendar_email
+        user.google_calendar_sync_token = None  # Force a full sync for the connected calendar
+        
+        # Claim the connection data in the same transaction; a concurrent request
+        # that already deleted it wins, and this one must not apply the tokens
+        claimed = db.query(PendingCalendarConnection).filter(
+            PendingCalendarConnection.id == connection_id
+        ).delete(synchronize_session=False)
+        if not claimed:
+            db.rollback()
+            raise HTTPException(status_code=404, detail="Calendar connection not found or expired")
         
         db.commit()
-        print(f"Calendar connected for user {user.email}")
-        
-        # Clean up the temporary connection data
-        del router.state.pending_calendar_connections[connection_id]
+        logger.info("Calendar connected for user %s", user.email)
+        background_sync_service.trigger_now()
         
         # Auto-sync calendar availability
         try:
@@ -237,7 +246,7 @@ async def complete_calendar_connection(
             # Don't fail the connection if sync fails
             pass
         
-        return {"success": True, "calendar_email": connection_data['calendar_email']}
+        return {"success": True, "calendar_email": calendar_email}
         
     except Exception as e:
         raise HTTPException(status_code=400, detail="Calendar connection failed")
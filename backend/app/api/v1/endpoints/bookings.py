@@ -20,13 +20,14 @@ from app.services.booking_service import (
     cancel_booking,
     get_upcoming_bookings,
 )
+from app.services.availability_service import get_availability_slot
 from app.services.user_service import get_user_by_scheduling_slug
 
 router = APIRouter()
 
 
 @router.post("/book-slot/{slot_id}", response_model=BookingConfirmation)
-async def book_slot_public(
+def book_slot_public(
     slot_id: int,
     guest_name: str = Form(...),
     guest_email: str = Form(...),
@@ -41,7 +42,6 @@ async def book_slot_public(
     )
     
     # Get the slot to find the host user
-    from app.services.availability_service import get_availability_slot
     slot = get_availability_slot(db, slot_id)
     if not slot:
         raise HTTPException(
@@ -155,8 +155,8 @@ def cancel_user_booking(
     current_user: User = Depends(get_current_active_user),
 ):
     """Cancel a booking."""
-    success = cancel_booking(db=db, booking_id=booking_id, user_id=current_user.id)
-    if not success:
+    booking = cancel_booking(db=db, booking_id=booking_id, user_id=current_user.id)
+    if not booking:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Booking not found"
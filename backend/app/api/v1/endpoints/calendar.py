@@ -10,7 +10,7 @@ router = APIRouter()
 
 
 @router.get("/calendar/events")
-async def get_calendar_events(
+def get_calendar_events(
     current_user: User = Depends(get_current_active_user),
 ) -> Any:
     """Get calendar events for the authenticated user."""
@@ -23,7 +23,7 @@ async def get_calendar_events(
 
 
 @router.post("/calendar/connect")
-async def connect_google_calendar(
+def connect_google_calendar(
     current_user: User = Depends(get_current_active_user),
     auth_code: str = None,
 ) -> Any:
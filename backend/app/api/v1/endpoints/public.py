@@ -1,9 +1,9 @@
+import asyncio
 from typing import Any, List
 from datetime import datetime, timedelta, timezone
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Form
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 
 from app.models.models import User as UserModel
 from app.services.user_service import get_user_by_scheduling_slug
@@ -13,10 +13,10 @@ from app.schemas.schemas import PublicBookingCreate, BookingConfirmation
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.core.timezone_utils import TimezoneManager
+from app.core.templates import templates
 from zoneinfo import ZoneInfo
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/{scheduling_slug}", response_class=HTMLResponse)
@@ -53,9 +53,11 @@ async def get_user_availability(
         # Parse the date and treat it as local time (user's timezone)
         selected_date = datetime.strptime(date, "%Y-%m-%d")
         
-        # Get available slots for this date
+        # Get available slots for this date; the session queries block, so keep
+        # them off the event loop
         availability_service = AvailabilityService(db)
-        available_slots = availability_service.get_user_availability_slots(
+        available_slots = await asyncio.to_thread(
+            availability_service.get_user_availability_slots,
             user_id=user.id,
             date=selected_date,
             duration_minutes=30
@@ -63,6 +65,7 @@ async def get_user_availability(
         
         # Get user's timezone
         host_timezone = TimezoneManager.get_user_timezone(user.timezone)
+        host_tz = ZoneInfo(host_timezone)
         
         # Format slots for frontend with timezone conversion
         formatted_slots = []
@@ -78,8 +81,8 @@ async def get_user_availability(
                 end_time = end_time.replace(tzinfo=timezone.utc)
             
             # Convert to user's timezone for display
-            user_start_time = start_time.astimezone(ZoneInfo(host_timezone))
-            user_end_time = end_time.astimezone(ZoneInfo(host_timezone))
+            user_start_time = start_time.astimezone(host_tz)
+            user_end_time = end_time.astimezone(host_tz)
             
             formatted_slots.append({
                 'start_time': user_start_time.strftime('%I:%M %p'),
@@ -113,6 +116,8 @@ async def create_public_scheduling(
 ) -> JSONResponse:
     """Create a booking for the public interface."""
     user = await get_user_by_scheduling_slug(db, scheduling_slug)
+    # The slug lookup is cached; booking needs the host's current Google tokens
+    user = db.get(UserModel, user.id) if user else None
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -184,14 +189,7 @@ async def create_public_scheduling(
         if not slot_id:
             raise HTTPException(status_code=400, detail="Invalid slot data")
         
-        # Verify the slot is still available
-        from app.services.availability_service import check_slot_availability
-        try:
-            if not check_slot_availability(db, slot_id):
-                raise HTTPException(status_code=400, detail="Selected time slot is no longer available")
-        except Exception as slot_error:
-            raise HTTPException(status_code=400, detail=f"Error checking slot availability: {str(slot_error)}")
-        
+        # create_booking re-checks that the slot is still bookable
         # Create booking data
         booking_data = PublicBookingCreate(
             guest_name=guest_name,
@@ -201,7 +199,8 @@ async def create_public_scheduling(
         
         # Create the booking
         try:
-            booking = create_booking(db, booking_data, slot_id, user)
+            # Commits and calls Google Calendar, so keep it off the event loop
+            booking = await asyncio.to_thread(create_booking, db, booking_data, slot_id, user)
             
             if not booking:
                 raise HTTPException(status_code=400, detail="Unable to create booking. Slot may no longer be available.")
@@ -3,7 +3,6 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, Form, HTTPException, Query, Request, Response, status
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from pydantic import EmailStr, ValidationError
 import re
 import requests
@@ -12,11 +11,23 @@ from app.core.config import settings
 from app.core.database import get_db
 from app.core.security import create_access_token
 from app.schemas.schemas import UserCreate
-from app.services.user_service import authenticate_user, create_user, get_user_by_email
+from app.services.user_service import authenticate_user, create_user, email_exists
+from app.core.templates import templates
 from sqlalchemy.orm import Session
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+# Fixed HTMX fragments, encoded once so the hot auth paths skip str.encode per response
+_REDIRECT_TO_DASHBOARD = '<script>setTimeout(()=>window.location.href="/dashboard", 1000);</script>'
+_INVALID_CREDENTIALS_HTML = b'<div class="text-red-500">Invalid email or password.</div>'
+_LOGIN_SUCCESS_HTML = ('<div class="text-green-500">Login successful! Redirecting...</div>' + _REDIRECT_TO_DASHBOARD).encode()
+_INVALID_EMAIL_HTML = b'<div class="text-red-500">Invalid email address.</div>'
+_WEAK_PASSWORD_HTML = b'<div class="text-red-500">Password must be at least 8 characters and include a letter and a number.</div>'
+_EMAIL_TAKEN_HTML = b'<div class="text-red-500">A user with this email already exists.</div>'
+_REGISTER_SUCCESS_HTML = ('<div class="text-green-500">Registration successful! Redirecting...</div>' + _REDIRECT_TO_DASHBOARD).encode()
+
+_HAS_LETTER = re.compile(r"[A-Za-z]")
+_HAS_DIGIT = re.compile(r"\d")
 
 
 @router.get("/login", response_class=HTMLResponse)
@@ -36,15 +47,10 @@ async def login_post(
     """Handle login form submission"""
     user = await authenticate_user(db, username, password)
     if not user:
-        return HTMLResponse(
-            content='<div class="text-red-500">Invalid email or password.</div>',
-            status_code=status.HTTP_401_UNAUTHORIZED,
-        )
+        return HTMLResponse(content=_INVALID_CREDENTIALS_HTML, status_code=status.HTTP_401_UNAUTHORIZED)
     
     access_token = create_access_token(data={"sub": user.email})
-    response = HTMLResponse(
-        content='<div class="text-green-500">Login successful! Redirecting...</div><script>setTimeout(()=>window.location.href="/dashboard", 1000);</script>'
-    )
+    response = HTMLResponse(content=_LOGIN_SUCCESS_HTML)
     response.set_cookie(
         key="access_token",
         value=f"Bearer {access_token}",
@@ -76,16 +82,15 @@ async def register_post(
     try:
         email_obj = EmailStr.validate(email)
     except ValidationError:
-        return HTMLResponse('<div class="text-red-500">Invalid email address.</div>', status_code=400)
+        return HTMLResponse(_INVALID_EMAIL_HTML, status_code=400)
     
     # Validate password strength (min 8 chars, at least 1 letter and 1 number)
-    if len(password) < 8 or not re.search(r"[A-Za-z]", password) or not re.search(r"\d", password):
-        return HTMLResponse('<div class="text-red-500">Password must be at least 8 characters and include a letter and a number.</div>', status_code=400)
+    if len(password) < 8 or not _HAS_LETTER.search(password) or not _HAS_DIGIT.search(password):
+        return HTMLResponse(_WEAK_PASSWORD_HTML, status_code=400)
     
     # Check for existing user
-    existing = await get_user_by_email(db, email)
-    if existing:
-        return HTMLResponse('<div class="text-red-500">A user with this email already exists.</div>', status_code=400)
+    if email_exists(db, email):
+        return HTMLResponse(_EMAIL_TAKEN_HTML, status_code=400)
     
     # Create user
     try:
@@ -96,7 +101,7 @@ async def register_post(
     
     # Auto-login after registration
     access_token = create_access_token(data={"sub": user.email})
-    response = HTMLResponse('<div class="text-green-500">Registration successful! Redirecting...</div><script>setTimeout(()=>window.location.href="/dashboard", 1000);</script>')
+    response = HTMLResponse(_REGISTER_SUCCESS_HTML)
     response.set_cookie(
         key="access_token",
         value=f"Bearer {access_token}",
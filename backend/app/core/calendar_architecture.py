@@ -137,7 +137,7 @@ class CalendarSyncService:
         self.db = db
         self.user_id = user_id
         self.providers: Dict[CalendarProviderType, BaseCalendarProvider] = {}
-        logger.info(f"Initialized CalendarSyncService for user {user_id}")
+        logger.info("Initialized CalendarSyncService for user %s", user_id)
     
     def register_provider(self, provider: BaseCalendarProvider) -> None:
         """
@@ -153,7 +153,7 @@ class CalendarSyncService:
             raise ValueError("Provider must implement BaseCalendarProvider")
         
         self.providers[provider.provider_type] = provider
-        logger.info(f"Registered {provider.provider_type.value} provider for user {self.user_id}")
+        logger.info("Registered %s provider for user %s", provider.provider_type.value, self.user_id)
     
     def sync_event_to_providers(self, event_id: str, event_data: Dict[str, Any],
                                operation: str = "create") -> Dict[str, Any]:
@@ -176,11 +176,11 @@ class CalendarSyncService:
             raise ValueError(f"Unsupported operation: {operation}")
         
         results = {}
-        logger.info(f"Starting {operation} sync for event {event_id} to {len(self.providers)} providers")
+        logger.info("Starting %s sync for event %s to %s providers", operation, event_id, len(self.providers))
         
         for provider_type, provider in self.providers.items():
             try:
-                logger.debug(f"Syncing to {provider_type.value} provider")
+                logger.debug("Syncing to %s provider", provider_type.value)
                 
                 if operation == "create":
                     result = provider.create_event(event_data)
@@ -195,7 +195,7 @@ class CalendarSyncService:
                     "sync_status": SyncStatus.SYNCED
                 }
                 
-                logger.info(f"Successfully synced {operation} to {provider_type.value}")
+                logger.info("Successfully synced %s to %s", operation, provider_type.value)
                 
             except Exception as e:
                 logger.error(f"Failed to sync {operation} to {provider_type.value}: {str(e)}")
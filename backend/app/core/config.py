@@ -6,6 +6,9 @@ from pydantic_settings import BaseSettings
 class Settings(BaseSettings):
     # Database
     DATABASE_URL: str = "sqlite:///./appointment_agent.db"
+    # Create missing tables when the app starts. Multi-worker deploys can turn this
+    # off and run app.core.database.init_db() once before starting the workers.
+    CREATE_TABLES_ON_STARTUP: bool = True
     
     # Security
     SECRET_KEY: str = "your-secret-key-here"
@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, inspect, text
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import QueuePool
@@ -20,6 +20,74 @@ engine = create_engine(
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Columns added to tables that already exist in deployed databases. create_all never
+# alters an existing table, so init_db adds any of these that are missing. They are
+# all nullable, so no backfill is needed.
+ADDED_COLUMNS = (
+    ("users", "google_calendar_sync_token"),
+    ("bookings", "last_webhook_hash"),
+)
+
+def _add_missing_columns(bind):
+    inspector = inspect(bind)
+    existing_columns = {}
+    with bind.begin() as connection:
+        for table_name, column_name in ADDED_COLUMNS:
+            if table_name not in existing_columns:
+                existing_columns[table_name] = {column["name"] for column in inspector.get_columns(table_name)}
+            if column_name in existing_columns[table_name]:
+                continue
+            column_type = Base.metadata.tables[table_name].c[column_name].type.compile(dialect=bind.dialect)
+            connection.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
+
+# Slots sharing a user and start time, other than the lowest id of each group
+_DUPLICATE_SLOT = (
+    "EXISTS (SELECT 1 FROM availability_slots o WHERE o.user_id = {t}.user_id "
+    "AND o.start_time = {t}.start_time AND o.id < {t}.id)"
+)
+
+def _ensure_unique_slot_starts(bind):
+    """Replace the per-user start time index with the unique one slot creation relies on.
+
+    Tables created before the index existed may hold duplicate starts, so those are
+    merged into the lowest id first: bookings are repointed to it, and it stays
+    unavailable if any duplicate was.
+    """
+    if any(index["name"] == "uq_availability_slots_user_start"
+           for index in inspect(bind).get_indexes("availability_slots")):
+        return
+    
+    with bind.begin() as connection:
+        connection.execute(text(
+            "UPDATE availability_slots SET is_available = :unavailable WHERE EXISTS ("
+            "SELECT 1 FROM availability_slots o WHERE o.user_id = availability_slots.user_id "
+            "AND o.start_time = availability_slots.start_time AND o.is_available = :unavailable)"
+        ), {"unavailable": False})
+        connection.execute(text(
+            "UPDATE bookings SET availability_slot_id = ("
+            "SELECT MIN(k.id) FROM availability_slots k JOIN availability_slots d "
+            "ON k.user_id = d.user_id AND k.start_time = d.start_time "
+            "WHERE d.id = bookings.availability_slot_id) "
+            "WHERE availability_slot_id IN (SELECT s.id FROM availability_slots s WHERE "
+            + _DUPLICATE_SLOT.format(t="s") + ")"
+        ))
+        connection.execute(text(
+            "DELETE FROM availability_slots WHERE " + _DUPLICATE_SLOT.format(t="availability_slots")
+        ))
+        connection.execute(text("DROP INDEX IF EXISTS ix_availability_slots_user_start"))
+        connection.execute(text(
+            "CREATE UNIQUE INDEX IF NOT EXISTS uq_availability_slots_user_start "
+            "ON availability_slots (user_id, start_time)"
+        ))
+
+def init_db(bind=None):
+    """Create any missing tables, and bring tables created by older versions up to date."""
+    import app.models.models  # noqa: F401  (registers the models on Base.metadata)
+    bind = bind if bind is not None else engine
+    Base.metadata.create_all(bind=bind)
+    _add_missing_columns(bind)
+    _ensure_unique_slot_starts(bind)
+
 def get_db():
     db = SessionLocal()
     try:
@@ -27,14 +95,13 @@ def get_db():
     finally:
         db.close()
 
-from sqlalchemy import text
 
 def check_db_connection():
     """Check if database connection is healthy."""
     try:
-        db = SessionLocal()
-        db.execute(text("SELECT 1"))
-        db.close()
+        # A bare pooled connection is enough for a ping; no Session/transaction needed
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
         return True
     except Exception as e:
         print(f"Database connection check failed: {str(e)}")
@@ -1,5 +1,7 @@
+import threading
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
@@ -32,9 +34,30 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+# Decoded payloads of recently verified tokens. Dashboard pages poll with the same
+# cookie many times a minute, so skip re-checking the signature on every request.
+TOKEN_CACHE_TTL = 300  # seconds
+TOKEN_CACHE_MAX_SIZE = 10_000
+_token_cache: Dict[str, Tuple[dict, float]] = {}  # token -> (payload, wall-clock deadline)
+_token_cache_lock = threading.Lock()
+
+
 def verify_token(token: str):
+    now = time.time()
+    with _token_cache_lock:
+        cached = _token_cache.get(token)
+    if cached is not None and now < cached[1]:
+        return cached[0]
+    
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        return payload
     except JWTError:
         return None
+    
+    # Never serve a cached payload past the token's own expiry
+    deadline = min(now + TOKEN_CACHE_TTL, payload.get("exp", now))
+    with _token_cache_lock:
+        if len(_token_cache) >= TOKEN_CACHE_MAX_SIZE:
+            _token_cache.pop(next(iter(_token_cache)))  # Drop the oldest entry
+        _token_cache[token] = (payload, deadline)
+    return payload
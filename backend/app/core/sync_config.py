@@ -28,8 +28,13 @@ class SyncConfig:
         self.retry_attempts = 3
         self.retry_delay = 5  # seconds
         self.batch_size = 50
+        self.discovery_chunk_size = 500  # Bookings loaded per discovery query in a sync cycle
+        self.max_concurrency = 10  # Max users synced at the same time
         self.sync_interval = timedelta(minutes=15)
         self.background_sync_interval = 300  # 5 minutes in seconds (reduced frequency)
+        self.background_sync_jitter = 60  # Max random delay in seconds added to each cycle
+        self.sync_lookback_days = 30  # Bookings that ended before this are no longer synced
+        self.calendar_sync_window_days = 7  # Days before/after now covered by a full calendar sync
         
         # Conflict resolution settings
         self.conflict_resolution = "database_wins"  # or "provider_wins", "manual"
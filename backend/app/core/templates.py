@@ -0,0 +1,11 @@
+from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
+
+from app.core.config import settings
+
+# One environment shared by every router, so each template is parsed and compiled
+# once per process. Compiled bytecode is also cached on disk (keyed by source
+# checksum), so restarted or additional workers skip the compile step entirely.
+templates = Jinja2Templates(directory="app/templates")
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+templates.env.auto_reload = settings.DEBUG  # Skip per-render mtime checks in production
@@ -1,7 +1,7 @@
 import uuid
 from datetime import datetime
 
-from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, Index, text
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.core.database import Base
@@ -16,12 +16,13 @@ class User(Base):
     hashed_password = Column(String, nullable=True)  # Nullable for Google users
     is_active = Column(Boolean, default=True)
     is_verified = Column(Boolean, default=False)  # Email verification status
-    verification_token = Column(String, nullable=True)  # For email verification
+    verification_token = Column(String, nullable=True, index=True)  # For email verification
     google_id = Column(String, nullable=True)
     google_access_token = Column(String, nullable=True)
     google_refresh_token = Column(String, nullable=True)
     google_calendar_connected = Column(Boolean, default=False)  # Track if calendar is connected
     google_calendar_email = Column(String, nullable=True)  # Email of the Google account used for calendar
+    google_calendar_sync_token = Column(String, nullable=True)  # Google nextSyncToken for incremental calendar sync
     scheduling_slug = Column(String, unique=True, index=True)  # For shareable booking links
     timezone = Column(String, default='UTC')  # User's timezone (e.g., 'America/New_York', 'Europe/London')
     
@@ -50,6 +51,12 @@ class AvailabilitySlot(Base):
     user = relationship("User", back_populates="availability_slots")
     bookings = relationship("Booking", back_populates="availability_slot")
 
+    __table_args__ = (
+        # One slot per user per start time; also serves per-user lookups by start
+        # time (existing-slot checks, range listings) and the quick-add ON CONFLICT
+        Index("uq_availability_slots_user_start", "user_id", "start_time", unique=True),
+    )
+
 
 class Booking(Base):
     __tablename__ = "bookings"
@@ -70,6 +77,7 @@ class Booking(Base):
     
     # Google Calendar integration
     google_event_id = Column(String, nullable=True)  # Store Google Calendar event ID
+    last_webhook_hash = Column(String, nullable=True)  # Hash of the last calendar webhook payload applied
     
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
@@ -77,3 +85,35 @@ class Booking(Base):
     # Relationships
     host = relationship("User", foreign_keys=[host_user_id], back_populates="bookings_as_host")
     availability_slot = relationship("AvailabilitySlot", back_populates="bookings")
+
+    __table_args__ = (
+        # Partial index matching the background sync "needs sync" predicate,
+        # so each cycle only touches the unsynced backlog
+        Index(
+            "ix_bookings_needs_sync",
+            "end_time",
+            postgresql_where=text("google_event_id IS NULL AND status != 'cancelled'"),
+            sqlite_where=text("google_event_id IS NULL AND status != 'cancelled'"),
+        ),
+        # Unsynced bookings in id order, for the manual resync of failed bookings
+        Index(
+            "ix_bookings_unsynced",
+            "id",
+            postgresql_where=text("google_event_id IS NULL"),
+            sqlite_where=text("google_event_id IS NULL"),
+        ),
+    )
+
+
+class PendingCalendarConnection(Base):
+    """Google Calendar tokens from an OAuth callback, waiting for the user to confirm the connection."""
+    __tablename__ = "pending_calendar_connections"
+
+    id = Column(String, primary_key=True)  # Connection id handed to the dashboard
+    calendar_email = Column(String, nullable=True)
+    calendar_name = Column(String, nullable=True)
+    access_token = Column(String, nullable=False)
+    refresh_token = Column(String, nullable=True)
+    scope = Column(String, nullable=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -1,46 +1,37 @@
+import logging
+from typing import Optional
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.services.user_service import get_user_by_email
-from app.core.security import verify_token
+from app.api.deps import get_optional_user_from_cookie
+from app.models.models import User
 from app.services.availability_service import get_availability_slots_for_user
 from app.core.timezone_utils import TimezoneManager
+from app.core.templates import templates
 from datetime import timezone
 from zoneinfo import ZoneInfo
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+logger = logging.getLogger(__name__)
 
 @router.get("/availability")
-async def availability_page(request: Request, db: Session = Depends(get_db)):
+def availability_page(
+    request: Request,
+    user: Optional[User] = Depends(get_optional_user_from_cookie),
+    db: Session = Depends(get_db)
+):
     """Availability management page"""
-    access_token = request.cookies.get("access_token")
-
-    if not access_token:
+    if not user:
         return RedirectResponse(url="/", status_code=302)
 
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return RedirectResponse(url="/", status_code=302)
-
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-
-        if not user:
-            return RedirectResponse(url="/", status_code=302)
-
         # Get user's availability slots (including booked ones)
         availability_slots = get_availability_slots_for_user(db, user.id, include_unavailable=True)
 
         # Get user's timezone
         user_timezone = TimezoneManager.get_user_timezone(user.timezone)
+        user_tz = ZoneInfo(user_timezone)
 
         # Convert times to user's timezone for display
         for slot in availability_slots:
@@ -51,8 +42,8 @@ async def availability_page(request: Request, db: Session = Depends(get_db)):
                 slot.end_time = slot.end_time.replace(tzinfo=timezone.utc)
             
             # Convert to user's timezone
-            slot.start_time = slot.start_time.astimezone(ZoneInfo(user_timezone))
-            slot.end_time = slot.end_time.astimezone(ZoneInfo(user_timezone))
+            slot.start_time = slot.start_time.astimezone(user_tz)
+            slot.end_time = slot.end_time.astimezone(user_tz)
 
         return templates.TemplateResponse("availability.html", {
             "request": request,
@@ -61,5 +52,5 @@ async def availability_page(request: Request, db: Session = Depends(get_db)):
         })
 
     except Exception as e:
-        print(f"Availability page error: {e}")
+        logger.exception("Availability page error: %s", e)
         return RedirectResponse(url="/", status_code=302) 
\ No newline at end of file
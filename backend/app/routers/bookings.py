@@ -1,74 +1,54 @@
+import logging
+from typing import Optional
 from fastapi import APIRouter, Request, Depends
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.services.user_service import get_user_by_email
-from app.core.security import verify_token
+from app.api.deps import get_optional_user_from_cookie
+from app.models.models import User
 from app.services.booking_service import get_bookings_for_user
+from app.core.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+logger = logging.getLogger(__name__)
 
 @router.get("/bookings")
-async def bookings_page(request: Request, db: Session = Depends(get_db)):
+def bookings_page(
+    request: Request,
+    user: Optional[User] = Depends(get_optional_user_from_cookie),
+    db: Session = Depends(get_db)
+):
     """Bookings management page"""
-    access_token = request.cookies.get("access_token")
-
-    if not access_token:
+    if not user:
         return RedirectResponse(url="/", status_code=302)
 
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return RedirectResponse(url="/", status_code=302)
-
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-
-        if not user:
-            return RedirectResponse(url="/", status_code=302)
-
         return templates.TemplateResponse("bookings.html", {
             "request": request,
             "current_user": user
         })
 
     except Exception as e:
-        print(f"Bookings page error: {e}")
+        logger.exception("Bookings page error: %s", e)
         return RedirectResponse(url="/", status_code=302)
 
 @router.get("/bookings/api/list")
-async def bookings_list(request: Request, db: Session = Depends(get_db)):
+def bookings_list(
+    request: Request,
+    user: Optional[User] = Depends(get_optional_user_from_cookie),
+    db: Session = Depends(get_db)
+):
     """Get user's bookings list"""
-    access_token = request.cookies.get("access_token")
-    
-    if not access_token:
+    if not user:
         return {"error": "Not authenticated"}
 
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-    
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return {"error": "Invalid token"}
-        
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-        
-        if not user:
-            return {"error": "User not found"}
-        
         # Get user's bookings
-        bookings = get_bookings_for_user(db, user.id)
+        bookings = get_bookings_for_user(db, user.id, summary_only=True)
         
-        return {
+        # Already plain JSON types; a JSONResponse skips FastAPI's jsonable_encoder
+        # walk over every row
+        return JSONResponse({
             "bookings": [
                 {
                     "id": booking.id,
@@ -81,7 +61,7 @@ async def bookings_list(request: Request, db: Session = Depends(get_db)):
                     "created_at": booking.created_at.isoformat()
                 } for booking in bookings
             ]
-        }
+        })
     except Exception as e:
         return {"error": str(e)}
 
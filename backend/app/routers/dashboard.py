@@ -1,21 +1,25 @@
+import asyncio
+import logging
+from typing import Optional
 from fastapi import APIRouter, Request, Depends, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, JSONResponse, RedirectResponse
 from sqlalchemy.orm import Session
 from app.core.database import get_db
-from app.services.user_service import get_user_by_email
-from app.core.security import verify_token
+from app.api.deps import get_optional_user_from_cookie
+from app.models.models import User
+from app.schemas.schemas import QuickAvailabilityRequest
 from app.services.advanced_ai_agent_service import AdvancedAIAgentService
-from app.services.availability_service import get_availability_slots_for_user
-from app.services.booking_service import get_upcoming_bookings
+from app.services.availability_service import create_availability_slots_bulk, get_availability_slots_for_user
+from app.services.booking_service import count_bookings_for_user, get_upcoming_bookings
 from app.services.google_calendar_service import GoogleCalendarService
 import json
 from app.core.timezone_utils import TimezoneManager
+from app.core.templates import templates
 from datetime import timezone
 from zoneinfo import ZoneInfo
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+logger = logging.getLogger(__name__)
 
 @router.get("/agent")
 async def agent_redirect(request: Request):
@@ -24,34 +28,25 @@ async def agent_redirect(request: Request):
     redirect_url = f"/dashboard{'?' + query_string if query_string else ''}"
     return RedirectResponse(url=redirect_url, status_code=302)
 
+# Handlers that only do blocking DB work are plain defs, so FastAPI runs them in
+# its threadpool instead of stalling the event loop on every query
 @router.get("/dashboard")
-async def dashboard(request: Request, db: Session = Depends(get_db)):
+def dashboard(
+    request: Request,
+    user: Optional[User] = Depends(get_optional_user_from_cookie),
+    db: Session = Depends(get_db)
+):
     """Dashboard Interface"""
-    access_token = request.cookies.get("access_token")
-
-    if not access_token:
+    if not user:
         return RedirectResponse(url="/", status_code=302)
 
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return RedirectResponse(url="/", status_code=302)
-
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-
-        if not user:
-            return RedirectResponse(url="/", status_code=302)
-
         # Get user's availability slots (including booked ones)
         availability_slots = get_availability_slots_for_user(db, user.id, include_unavailable=True)
         
         # Get user's timezone
         user_timezone = TimezoneManager.get_user_timezone(user.timezone)
+        user_tz = ZoneInfo(user_timezone)
 
         # Convert times to user's timezone for display
         for slot in availability_slots:
@@ -62,8 +57,8 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
                 slot.end_time = slot.end_time.replace(tzinfo=timezone.utc)
             
             # Convert to user's timezone
-            slot.start_time = slot.start_time.astimezone(ZoneInfo(user_timezone))
-            slot.end_time = slot.end_time.astimezone(ZoneInfo(user_timezone))
+            slot.start_time = slot.start_time.astimezone(user_tz)
+            slot.end_time = slot.end_time.astimezone(user_tz)
         
         # Get upcoming bookings
         upcoming_bookings = get_upcoming_bookings(db, user.id, limit=5)
@@ -79,28 +74,15 @@ async def dashboard(request: Request, db: Session = Depends(get_db)):
         return RedirectResponse(url="/", status_code=302)
 
 @router.get("/dashboard/api/user/status")
-async def dashboard_user_status(request: Request, db: Session = Depends(get_db)):
+def dashboard_user_status(
+    request: Request,
+    user: Optional[User] = Depends(get_optional_user_from_cookie)
+):
     """Get user status for dashboard"""
-    access_token = request.cookies.get("access_token")
-    
-    if not access_token:
+    if not user:
         return {"authenticated": False}
-    
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-    
+
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return {"authenticated": False}
-        
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-        
-        if not user:
-            return {"authenticated": False}
-        
         return {
             "authenticated": True,
             "user": {
@@ -115,38 +97,27 @@ async def dashboard_user_status(request: Request, db: Session = Depends(get_db))
         return {"authenticated": False, "error": str(e)}
 
 @router.get("/dashboard/api/data")
-async def dashboard_data(request: Request, db: Session = Depends(get_db)):
+def dashboard_data(
+    request: Request,
+    user: Optional[User] = Depends(get_optional_user_from_cookie),
+    db: Session = Depends(get_db)
+):
     """Get dashboard data"""
-    access_token = request.cookies.get("access_token")
-    
-    if not access_token:
-        return {"error": "Not authenticated"}
+    if not user:
+        return {"authenticated": False, "error": "Not authenticated"}
 
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-    
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return {"error": "Invalid token"}
-        
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-        
-        if not user:
-            return {"error": "User not found"}
-        
         # Get availability slots with error handling (including booked ones)
         try:
             availability_slots = get_availability_slots_for_user(db, user.id, include_unavailable=True)
-            print(f"Successfully retrieved {len(availability_slots)} availability slots for user {user.id}")
+            logger.debug("Retrieved %d availability slots for user %s", len(availability_slots), user.id)
         except Exception as e:
-            print(f"Error getting availability slots for user {user.id}: {e}")
+            logger.exception("Error getting availability slots for user %s: %s", user.id, e)
             availability_slots = []
         
         # Get user's timezone
         user_timezone = TimezoneManager.get_user_timezone(user.timezone)
+        user_tz = ZoneInfo(user_timezone)
         
         # Convert times to user's timezone for display
         for slot in availability_slots:
@@ -157,15 +128,15 @@ async def dashboard_data(request: Request, db: Session = Depends(get_db)):
                 slot.end_time = slot.end_time.replace(tzinfo=timezone.utc)
             
             # Convert to user's timezone
-            slot.start_time = slot.start_time.astimezone(ZoneInfo(user_timezone))
-            slot.end_time = slot.end_time.astimezone(ZoneInfo(user_timezone))
+            slot.start_time = slot.start_time.astimezone(user_tz)
+            slot.end_time = slot.end_time.astimezone(user_tz)
         
         # Get upcoming bookings with error handling
         try:
-            upcoming_bookings = get_upcoming_bookings(db, user.id, limit=10)
-            print(f"Successfully retrieved {len(upcoming_bookings)} upcoming bookings for user {user.id}")
+            upcoming_bookings = get_upcoming_bookings(db, user.id, limit=10, summary_only=True)
+            logger.debug("Retrieved %d upcoming bookings for user %s", len(upcoming_bookings), user.id)
         except Exception as e:
-            print(f"Error getting upcoming bookings for user {user.id}: {e}")
+            logger.exception("Error getting upcoming bookings for user %s: %s", user.id, e)
             upcoming_bookings = []
         
         # Format data to match frontend expectations
@@ -178,12 +149,14 @@ async def dashboard_data(request: Request, db: Session = Depends(get_db)):
                 booking.end_time = booking.end_time.replace(tzinfo=timezone.utc)
             
             # Convert to user's timezone
-            booking_start_time = booking.start_time.astimezone(ZoneInfo(user_timezone))
-            booking_end_time = booking.end_time.astimezone(ZoneInfo(user_timezone))
+            booking_start_time = booking.start_time.astimezone(user_tz)
+            booking_end_time = booking.end_time.astimezone(user_tz)
             
-            # Format date and time for display
-            start_date = booking_start_time.strftime('%Y-%m-%d')
-            start_time = booking_start_time.strftime('%H:%M')
+            # Format date and time for display (sliced from the ISO form, which is
+            # cheaper than two strftime calls)
+            start_iso = booking_start_time.isoformat()
+            start_date = start_iso[:10]  # YYYY-MM-DD
+            start_time = start_iso[11:16]  # HH:MM
             
             formatted_bookings.append({
                 "id": booking.id,
@@ -200,50 +173,55 @@ async def dashboard_data(request: Request, db: Session = Depends(get_db)):
         # Format availability slots
         formatted_slots = []
         for slot in availability_slots:
+            # Date and HH:MM are slices of the ISO strings already being built
+            start_iso = slot.start_time.isoformat()
+            end_iso = slot.end_time.isoformat()
             formatted_slots.append({
                 "id": slot.id,
-                "start_time": slot.start_time.isoformat(),
-                "end_time": slot.end_time.isoformat(),
+                "start_time": start_iso,
+                "end_time": end_iso,
                 "is_available": slot.is_available,
-                "date": slot.start_time.strftime('%Y-%m-%d'),
-                "start_time_formatted": slot.start_time.strftime('%H:%M'),
-                "end_time_formatted": slot.end_time.strftime('%H:%M')
+                "date": start_iso[:10],
+                "start_time_formatted": start_iso[11:16],
+                "end_time_formatted": end_iso[11:16]
             })
         
-        return {
+        # Already plain JSON types; a JSONResponse skips FastAPI's jsonable_encoder
+        # walk over every slot and booking
+        return JSONResponse({
+            # The dashboard page loads with this single request, so it also carries
+            # what /dashboard/api/user/status reports
+            "authenticated": True,
+            "user": {
+                "id": user.id,
+                "email": user.email,
+                "name": user.full_name,
+                "google_calendar_connected": user.google_calendar_connected,
+                "scheduling_slug": user.scheduling_slug
+            },
             "availability_slots": formatted_slots,
             "upcoming_bookings": formatted_bookings,
             "upcomingCount": len(formatted_bookings),
-            "totalBookings": len(formatted_bookings),
+            "totalBookings": count_bookings_for_user(db, user.id),
             "availableCount": len(formatted_slots),
             "calendarConnected": user.google_calendar_connected
-        }
+        })
     except Exception as e:
-        return {"error": str(e)}
+        # Still signed in; the page shows the error instead of treating it as a logout
+        logger.exception("Dashboard data error for user %s: %s", user.id, e)
+        return {"authenticated": True, "error": str(e)}
 
 @router.post("/dashboard/api/chat")
-async def dashboard_chat(request: Request, db: Session = Depends(get_db)):
+async def dashboard_chat(
+    request: Request,
+    user: Optional[User] = Depends(get_optional_user_from_cookie),
+    db: Session = Depends(get_db)
+):
     """Handle dashboard chat with AI agent"""
-    access_token = request.cookies.get("access_token")
-    
-    if not access_token:
+    if not user:
         return {"error": "Not authenticated"}
 
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-    
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return {"error": "Invalid token"}
-        
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-        
-        if not user:
-            return {"error": "User not found"}
-        
         # Parse request body
         body = await request.body()
         data = json.loads(body)
@@ -253,35 +231,23 @@ async def dashboard_chat(request: Request, db: Session = Depends(get_db)):
         agent_service = AdvancedAIAgentService(db)
         
         # Process message
-        response = agent_service.process_message(user.id, message)
+        response = await asyncio.to_thread(agent_service.process_message, user.id, message)
         
         return response
     except Exception as e:
         return {"error": str(e)}
 
 @router.post("/dashboard/api/calendar/connect")
-async def dashboard_calendar_connect(request: Request, db: Session = Depends(get_db)):
+async def dashboard_calendar_connect(
+    request: Request,
+    user: Optional[User] = Depends(get_optional_user_from_cookie),
+    db: Session = Depends(get_db)
+):
     """Connect Google Calendar"""
-    access_token = request.cookies.get("access_token")
-    
-    if not access_token:
+    if not user:
         return {"error": "Not authenticated"}
 
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-    
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return {"error": "Invalid token"}
-        
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-        
-        if not user:
-            return {"error": "User not found"}
-        
         # Parse request body
         body = await request.body()
         data = json.loads(body)
@@ -299,42 +265,26 @@ async def dashboard_calendar_connect(request: Request, db: Session = Depends(get
         return {"error": str(e)}
 
 @router.post("/dashboard/api/availability/quick")
-async def dashboard_availability_quick(request: Request, db: Session = Depends(get_db)):
+async def dashboard_availability_quick(
+    payload: QuickAvailabilityRequest,
+    user: Optional[User] = Depends(get_optional_user_from_cookie),
+    db: Session = Depends(get_db)
+):
     """Quick availability setup"""
-    access_token = request.cookies.get("access_token")
-    
-    if not access_token:
+    if not user:
         return {"error": "Not authenticated"}
 
-    # Remove "Bearer " prefix if present
-    if access_token.startswith("Bearer "):
-        access_token = access_token[7:]
-    
     try:
-        payload = verify_token(access_token)
-        if not payload:
-            return {"error": "Invalid token"}
-        
-        user_email = payload.get("sub")
-        user = get_user_by_email(db, user_email)
-        
-        if not user:
-            return {"error": "User not found"}
-        
-        # Parse request body
-        body = await request.body()
-        data = json.loads(body)
-        
-        # Handle quick availability setup
-        from app.services.availability_service import create_availability_slots_bulk
-        
-        # Extract slots from the request data
-        slots_data = data.get('slots', [])
-        if not slots_data:
+        # The body is parsed and validated once by FastAPI; malformed batches are
+        # rejected with a 422 before any database work
+        if not payload.slots:
             return {"success": False, "message": "No slots provided"}
         
-        result = create_availability_slots_bulk(db, user.id, slots_data)
+        slots_data = [slot.model_dump(mode="json") for slot in payload.slots]
+        result = await asyncio.to_thread(create_availability_slots_bulk, db, user.id, slots_data)
         
-        return result
+        # The service returns ISO strings, counts and message lists only, so the
+        # jsonable_encoder pass over every created/existing slot can be skipped
+        return JSONResponse(result)
     except Exception as e:
         return {"error": str(e)} 
\ No newline at end of file
@@ -1,16 +1,35 @@
-from fastapi import APIRouter, Request, Depends
+import functools
+import hashlib
+from typing import Tuple
+
+from fastapi import APIRouter, Request, Depends, Response
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.orm import Session
 from app.core.database import get_db
 from app.services.user_service import get_user_by_email, create_user
 from app.core.security import verify_token, create_access_token
 from app.schemas.schemas import UserCreate
+from app.core.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+
+LANDING_PAGE_CACHE_CONTROL = "public, max-age=300"
+
+
+@functools.lru_cache(maxsize=1)
+def _rendered_landing_page() -> Tuple[str, str]:
+    """Render the landing page once; it has no per-request content. Returns (html, etag)."""
+    html = templates.get_template("landing_page.html").render()
+    return html, f'"{hashlib.sha256(html.encode()).hexdigest()[:32]}"'
+
 
 @router.get("/")
 async def landing_page(request: Request):
     """Landing page - main homepage"""
-    return templates.TemplateResponse("landing_page.html", {"request": request}) 
\ No newline at end of file
+    html, etag = _rendered_landing_page()
+    headers = {"Cache-Control": LANDING_PAGE_CACHE_CONTROL, "ETag": etag}
+    
+    # Browsers revalidating a page they already have get an empty 304
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(html, headers=headers) 
\ No newline at end of file
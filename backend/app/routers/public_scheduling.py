@@ -1,9 +1,9 @@
+import asyncio
 from typing import Any, List
 from datetime import datetime, timedelta
 
 from fastapi import APIRouter, Depends, HTTPException, Request, Form
 from fastapi.responses import HTMLResponse, JSONResponse
-from fastapi.templating import Jinja2Templates
 
 from app.models.models import User as UserModel
 from app.services.user_service import get_user_by_scheduling_slug
@@ -12,9 +12,9 @@ from app.services.booking_service import create_booking
 from app.schemas.schemas import PublicBookingCreate, BookingConfirmation
 from sqlalchemy.orm import Session
 from app.core.database import get_db
+from app.core.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/{scheduling_slug}", response_class=HTMLResponse)
@@ -51,9 +51,11 @@ async def get_user_availability(
         # Parse the date and treat it as local time (user's timezone)
         selected_date = datetime.strptime(date, "%Y-%m-%d")
         
-        # Get available slots for this date
+        # Get available slots for this date; the session queries block, so keep
+        # them off the event loop
         availability_service = AvailabilityService(db)
-        available_slots = availability_service.get_user_availability_slots(
+        available_slots = await asyncio.to_thread(
+            availability_service.get_user_availability_slots,
             user_id=user.id,
             date=selected_date,
             duration_minutes=30
@@ -96,6 +98,8 @@ async def create_public_scheduling(
 ) -> JSONResponse:
     """Create a booking for the public interface."""
     user = await get_user_by_scheduling_slug(db, scheduling_slug)
+    # The slug lookup is cached; booking needs the host's current Google tokens
+    user = db.get(UserModel, user.id) if user else None
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
@@ -137,11 +141,7 @@ async def create_public_scheduling(
         if not slot_id:
             raise HTTPException(status_code=400, detail="Invalid slot data")
         
-        # Verify the slot is still available
-        from app.services.availability_service import check_slot_availability
-        if not check_slot_availability(db, slot_id):
-            raise HTTPException(status_code=400, detail="Selected time slot is no longer available")
-        
+        # create_booking re-checks that the slot is still bookable
         # Create booking data
         booking_data = PublicBookingCreate(
             guest_name=guest_name,
@@ -149,8 +149,8 @@ async def create_public_scheduling(
             guest_message=guest_notes or ""
         )
         
-        # Create the booking
-        booking = create_booking(db, booking_data, slot_id, user)
+        # Create the booking; it commits and calls Google Calendar, so keep it off the event loop
+        booking = await asyncio.to_thread(create_booking, db, booking_data, slot_id, user)
         
         if not booking:
             raise HTTPException(status_code=400, detail="Unable to create booking. Slot may no longer be available.")
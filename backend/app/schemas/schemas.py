@@ -1,8 +1,8 @@
 import uuid
 from typing import Optional, List
-from datetime import datetime
+from datetime import date, datetime, time
 
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 
 
 class UserBase(BaseModel):
@@ -61,6 +61,16 @@ class AvailabilitySlot(AvailabilitySlotBase):
         from_attributes = True
 
 
+class QuickAvailabilitySlot(BaseModel):
+    date: date
+    start_time: time
+    period: int = Field(default=30, gt=0)  # Minutes
+
+
+class QuickAvailabilityRequest(BaseModel):
+    slots: List[QuickAvailabilitySlot] = []
+
+
 # Booking Schemas
 class BookingBase(BaseModel):
     guest_name: str
@@ -1,18 +1,37 @@
+import logging
 from typing import List, Optional, Dict, Any
 from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
 
 from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy import and_, insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects import postgresql, sqlite
 
 from app.models.models import AvailabilitySlot, User, Booking
 from app.schemas.schemas import AvailabilitySlotCreate, AvailabilitySlotUpdate
 from app.core.timezone_utils import TimezoneManager
+from app.services.google_calendar_service import GoogleCalendarService
+
+logger = logging.getLogger(__name__)
+
+
+def _slot_has_confirmed_booking(db: Session, slot_id: int) -> bool:
+    """Check whether a slot has a confirmed booking without loading the booking."""
+    return db.query(
+        db.query(Booking.id).filter(
+            and_(
+                Booking.availability_slot_id == slot_id,
+                Booking.status == "confirmed"
+            )
+        ).exists()
+    ).scalar()
 
 
 def create_availability_slot(db: Session, slot: AvailabilitySlotCreate, user_id: int) -> dict:
     """Create a new availability slot for a user."""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if not user:
             return {
                 "success": False,
@@ -44,7 +63,6 @@ def create_availability_slot(db: Session, slot: AvailabilitySlotCreate, user_id:
         if user.google_calendar_connected and user.google_access_token and user.google_refresh_token:
             try:
                 # Test calendar connection first
-                from app.services.google_calendar_service import GoogleCalendarService
                 calendar_service = GoogleCalendarService(
                     access_token=user.google_access_token,
                     refresh_token=user.google_refresh_token,
@@ -76,7 +94,19 @@ def create_availability_slot(db: Session, slot: AvailabilitySlotCreate, user_id:
             google_event_id=None  # Will be updated after calendar sync
         )
         db.add(db_slot)
-        db.commit()
+        try:
+            db.commit()
+        except IntegrityError:
+            # The unique (user_id, start_time) index: a slot already starts here
+            db.rollback()
+            return {
+                "success": False,
+                "message": "An availability slot already starts at this time",
+                "slot": None,
+                "calendar_created": False,
+                "calendar_error": None,
+                "google_event_id": None
+            }
         db.refresh(db_slot)
         
         calendar_created = None
@@ -132,9 +162,7 @@ def create_availability_slot(db: Session, slot: AvailabilitySlotCreate, user_id:
         }
         
     except Exception as e:
-        print(f"Error creating availability slot: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error creating availability slot: %s", e)
         return {
             "success": False,
             "message": f"Failed to create availability slot: {str(e)}",
@@ -189,14 +217,7 @@ def get_available_slots_for_booking(db: Session, user_id: int, from_date: dateti
     # Filter out slots that already have confirmed bookings
     available_slots = []
     for slot in query.all():
-        existing_booking = db.query(Booking).filter(
-            and_(
-                Booking.availability_slot_id == slot.id,
-                Booking.status == "confirmed"
-            )
-        ).first()
-        
-        if not existing_booking:
+        if not _slot_has_confirmed_booking(db, slot.id):
             available_slots.append(slot)
     
     return sorted(available_slots, key=lambda x: x.start_time)
@@ -241,41 +262,17 @@ def delete_availability_slot(db: Session, slot_id: int, user_id: int) -> dict:
         )
     ).all()
     
-    booking_deleted = False
-    if existing_bookings:
-        # Delete associated bookings first
-        for booking in existing_bookings:
-            # Delete Google Calendar event for the booking if it exists
-            if booking.google_event_id:
-                try:
-                    user = db.query(User).filter(User.id == booking.host_user_id).first()
-                    if user and user.google_access_token and user.google_refresh_token:
-                        from app.services.google_calendar_service import GoogleCalendarService
-                        calendar_service = GoogleCalendarService(
-                            access_token=user.google_access_token,
-                            refresh_token=user.google_refresh_token,
-                            db=db,
-                            user_id=user.id
-                        )
-                        calendar_service.delete_event(booking.google_event_id)
-                        print(f"Deleted Google Calendar event for booking {booking.id}")
-                except Exception as e:
-                    print(f"Failed to delete Google Calendar event for booking {booking.id}: {e}")
-            
-            # Delete the booking
-            db.delete(booking)
-            booking_deleted = True
-        
-        print(f"Deleted {len(existing_bookings)} associated booking(s)")
+    # The slot and its bookings all live on the slot owner's calendar, so their
+    # events are removed together in one batched request
+    event_ids = [booking.google_event_id for booking in existing_bookings if booking.google_event_id]
+    if slot.google_event_id:
+        event_ids.append(slot.google_event_id)
     
-    calendar_deleted = None
+    deleted_events = {}
     calendar_error = None
-    
-    # If slot is linked to a Google Calendar event, delete it from Google Calendar
-    if slot.google_event_id:
+    if event_ids:
         user = db.query(User).filter(User.id == slot.user_id).first()
         if user and user.google_access_token and user.google_refresh_token:
-            from app.services.google_calendar_service import GoogleCalendarService
             calendar_service = GoogleCalendarService(
                 access_token=user.google_access_token,
                 refresh_token=user.google_refresh_token,
@@ -283,18 +280,35 @@ def delete_availability_slot(db: Session, slot_id: int, user_id: int) -> dict:
                 user_id=user.id
             )
             try:
-                calendar_service.delete_event(slot.google_event_id)
-                calendar_deleted = True
+                deleted_events = calendar_service.delete_events_batch(event_ids)
             except Exception as e:
-                print(f"Failed to delete Google Calendar event: {e}")
-                calendar_deleted = False
+                logger.warning("Failed to delete Google Calendar events: %s", e)
                 calendar_error = str(e)
         else:
-            calendar_deleted = False
             calendar_error = "Google Calendar not connected"
+    
+    booking_deleted = False
+    if existing_bookings:
+        # Delete associated bookings first
+        for booking in existing_bookings:
+            if booking.google_event_id and deleted_events.get(booking.google_event_id):
+                logger.debug("Deleted Google Calendar event for booking %s", booking.id)
+            
+            # Delete the booking
+            db.delete(booking)
+            booking_deleted = True
+        
+        logger.debug("Deleted %d associated booking(s)", len(existing_bookings))
+    
+    # If slot is linked to a Google Calendar event, report whether it was removed
+    if slot.google_event_id:
+        calendar_deleted = deleted_events.get(slot.google_event_id, False)
+        if not calendar_deleted and calendar_error is None:
+            calendar_error = "Failed to delete Google Calendar event"
     else:
         # No Google Calendar event associated
         calendar_deleted = None
+        calendar_error = None
     
     # Delete the slot from database
     db.delete(slot)
@@ -316,7 +330,12 @@ def delete_availability_slot(db: Session, slot_id: int, user_id: int) -> dict:
 def check_slot_availability(db: Session, slot_id: int) -> bool:
     """Check if a slot is available for booking."""
     slot = get_availability_slot(db, slot_id)
-    if not slot or not slot.is_available:
+    return slot is not None and is_slot_bookable(db, slot)
+
+
+def is_slot_bookable(db: Session, slot: AvailabilitySlot) -> bool:
+    """Check if an already-loaded slot is available for booking."""
+    if not slot.is_available:
         return False
     
     # Check if slot is in the future - ensure timezone-aware comparison
@@ -331,19 +350,11 @@ def check_slot_availability(db: Session, slot_id: int) -> bool:
         return False
     
     # Check if slot is already booked
-    existing_booking = db.query(Booking).filter(
-        and_(
-            Booking.availability_slot_id == slot_id,
-            Booking.status == "confirmed"
-        )
-    ).first()
-    
-    return existing_booking is None
+    return not _slot_has_confirmed_booking(db, slot.id)
 
 
 def create_availability_slots_from_calendar(db: Session, user: User, start_date: datetime, end_date: datetime) -> List[AvailabilitySlot]:
     """Create availability slots based on Google Calendar availability."""
-    from app.services.google_calendar_service import GoogleCalendarService
     
     if not user.google_calendar_connected:
         raise Exception("User's Google Calendar is not connected")
@@ -355,15 +366,22 @@ def create_availability_slots_from_calendar(db: Session, user: User, start_date:
         db=db,
         user_id=user.id    )
     
-    created_slots = []
+    new_slot_rows = []
     current_date = start_date.date()
     end_date_obj = end_date.date()
     
+    # Fetch busy time for the whole range up front (one freeBusy query per 30 days)
+    # instead of one calendar request per day
+    busy_intervals = calendar_service.get_busy_intervals(
+        datetime.combine(current_date, datetime.min.time()).replace(tzinfo=timezone.utc),
+        datetime.combine(end_date_obj + timedelta(days=1), datetime.min.time()).replace(tzinfo=timezone.utc)
+    )
+    
     while current_date <= end_date_obj:
         # Get available slots for this date from Google Calendar
         # Create timezone-aware datetime for the date
         date_dt = datetime.combine(current_date, datetime.min.time()).replace(tzinfo=timezone.utc)
-        available_slots = calendar_service.get_available_slots(date_dt)
+        available_slots = calendar_service.get_available_slots(date_dt, busy_intervals=busy_intervals)
         
         # Create availability slots for each available time
         for slot_data in available_slots:
@@ -381,25 +399,80 @@ def create_availability_slots_from_calendar(db: Session, user: User, start_date:
             utc_start_time = start_time.astimezone(timezone.utc)
             utc_end_time = end_time.astimezone(timezone.utc)
             
-            db_slot = AvailabilitySlot(
-                user_id=user.id,
-                start_time=utc_start_time,
-                end_time=utc_end_time,
-                is_available=True
-            )
-            db.add(db_slot)
-            created_slots.append(db_slot)
+            new_slot_rows.append({
+                "user_id": user.id,
+                "start_time": utc_start_time,
+                "end_time": utc_end_time,
+                "is_available": True
+            })
         
         current_date += timedelta(days=1)
     
-    db.commit()
-    return created_slots
+    if not new_slot_rows:
+        return []
+    
+    # Insert the whole range with one statement; starts that already have a slot
+    # (e.g. when re-running over an overlapping range) are skipped, not an error
+    try:
+        new_ids = db.execute(
+            _insert_slots_ignoring_duplicates(db).returning(AvailabilitySlot.id),
+            new_slot_rows
+        ).scalars().all()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    if not new_ids:
+        return []
+    return db.query(AvailabilitySlot).filter(
+        AvailabilitySlot.id.in_(new_ids)
+    ).order_by(AvailabilitySlot.start_time).all()
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Normalize a stored datetime to UTC (some backends return naive UTC values)."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _slots_starting_at(db: Session, user_id: int, start_times: List[datetime]) -> List[AvailabilitySlot]:
+    """Load a user's slots starting at any of the given times."""
+    return db.query(AvailabilitySlot).filter(
+        and_(
+            AvailabilitySlot.user_id == user_id,
+            AvailabilitySlot.start_time.in_(start_times)
+        )
+    ).all()
+
+
+def _existing_slot_summary(slot: AvailabilitySlot) -> Dict[str, Any]:
+    """Describe a slot that already exists for the bulk create response."""
+    return {
+        "id": slot.id,
+        "start_time": slot.start_time.isoformat(),
+        "end_time": slot.end_time.isoformat(),
+        "is_available": slot.is_available,
+        "status": "booked" if not slot.is_available else "available"
+    }
+
+
+def _insert_slots_ignoring_duplicates(db: Session):
+    """INSERT for availability slots that skips rows clashing on (user_id, start_time)."""
+    dialect_name = db.get_bind().dialect.name
+    if dialect_name == "postgresql":
+        stmt = postgresql.insert(AvailabilitySlot)
+    elif dialect_name == "sqlite":
+        stmt = sqlite.insert(AvailabilitySlot)
+    else:
+        return insert(AvailabilitySlot)
+    return stmt.on_conflict_do_nothing(index_elements=["user_id", "start_time"])
 
 
 def create_availability_slots_bulk(db: Session, user_id: int, slots_data: List[Dict[str, Any]]) -> dict:
     """Create multiple availability slots for a user."""
     try:
-        user = db.query(User).filter(User.id == user_id).first()
+        user = db.get(User, user_id)
         if not user:
             return {
                 "success": False,
@@ -409,13 +482,15 @@ def create_availability_slots_bulk(db: Session, user_id: int, slots_data: List[D
                 "existing_slots": []
             }
         
-        # Get user's timezone
-        user_timezone = TimezoneManager.get_user_timezone(user.timezone)
+        # Get user's timezone, resolved once for the whole batch
+        user_tz = ZoneInfo(TimezoneManager.get_user_timezone(user.timezone))
         
-        created_slots = []
+        new_slot_rows = []
         existing_slots = []
         errors = []
         
+        # Parse every requested slot into UTC start/end times first
+        parsed_slots = []
         for slot_data in slots_data:
             try:
                 # Parse date and time
@@ -427,58 +502,82 @@ def create_availability_slots_bulk(db: Session, user_id: int, slots_data: List[D
                     errors.append(f"Missing date or start_time for slot: {slot_data}")
                     continue
                 
-                # Combine date and time and parse as naive datetime
-                datetime_str = f"{date_str} {start_time_str}"
-                naive_start_time = datetime.strptime(datetime_str, '%Y-%m-%d %H:%M')
+                # Combine date and time and parse as naive datetime; fromisoformat is a
+                # C fast path, unlike strptime's per-call format parsing
+                naive_start_time = datetime.fromisoformat(f"{date_str} {start_time_str}")
                 
-                # Convert naive datetime to timezone-aware datetime in user's timezone, then to UTC
-                user_start_time = TimezoneManager.make_timezone_aware(naive_start_time, user_timezone)
-                utc_start_time = user_start_time.astimezone(timezone.utc)
+                # Interpret in the user's timezone, then convert to UTC
+                utc_start_time = naive_start_time.replace(tzinfo=user_tz).astimezone(timezone.utc)
                 
                 # Calculate end time based on period
                 utc_end_time = utc_start_time + timedelta(minutes=period)
                 
-                # Check if slot already exists
-                existing_slot = db.query(AvailabilitySlot).filter(
-                    and_(
-                        AvailabilitySlot.user_id == user_id,
-                        AvailabilitySlot.start_time == utc_start_time,
-                        AvailabilitySlot.end_time == utc_end_time
-                    )
-                ).first()
+                parsed_slots.append((slot_data, utc_start_time, utc_end_time))
+                
+            except Exception as e:
+                errors.append(f"Error creating slot {slot_data}: {str(e)}")
+                continue
+        
+        # Look up all slots that already exist with a single query
+        existing_by_time = {}
+        if parsed_slots:
+            matching_slots = _slots_starting_at(db, user_id, [start for _, start, _ in parsed_slots])
+            existing_by_time = {
+                (_as_utc(slot.start_time), _as_utc(slot.end_time)): slot
+                for slot in matching_slots
+            }
+        
+        for slot_data, utc_start_time, utc_end_time in parsed_slots:
+            try:
+                existing_slot = existing_by_time.get((utc_start_time, utc_end_time))
                 
                 if existing_slot:
                     # Add existing slot to the response instead of just an error
-                    existing_slots.append({
-                        "id": existing_slot.id,
-                        "start_time": existing_slot.start_time.isoformat(),
-                        "end_time": existing_slot.end_time.isoformat(),
-                        "is_available": existing_slot.is_available,
-                        "status": "booked" if not existing_slot.is_available else "available"
-                    })
+                    existing_slots.append(_existing_slot_summary(existing_slot))
                     continue
                 
                 # Create the slot with UTC times
-                db_slot = AvailabilitySlot(
-                    user_id=user_id,
-                    start_time=utc_start_time,
-                    end_time=utc_end_time,
-                    is_available=True
-                )
-                db.add(db_slot)
-                created_slots.append(db_slot)
+                new_slot_rows.append({
+                    "user_id": user_id,
+                    "start_time": utc_start_time,
+                    "end_time": utc_end_time,
+                    "is_available": True
+                })
                 
             except Exception as e:
                 errors.append(f"Error creating slot {slot_data}: {str(e)}")
                 continue
         
-        # Commit all slots at once
-        if created_slots:
+        # Insert all slots with one batched INSERT ... ON CONFLICT DO NOTHING RETURNING,
+        # without building an ORM instance (and identity-map entry) per slot. The
+        # unique (user_id, start_time) index drops slots created concurrently since
+        # the lookup above, so only rows actually inserted come back.
+        created_slots = []
+        if new_slot_rows:
+            inserted = db.execute(
+                _insert_slots_ignoring_duplicates(db).returning(AvailabilitySlot.id, AvailabilitySlot.start_time),
+                new_slot_rows
+            ).all()
             db.commit()
+            rows_by_start = {}
+            for row in new_slot_rows:
+                rows_by_start.setdefault(row["start_time"], row)
+            created_slots = [
+                dict(rows_by_start[_as_utc(start_time)], id=slot_id)
+                for slot_id, start_time in inserted
+            ]
             
-            # Refresh all created slots
-            for slot in created_slots:
-                db.refresh(slot)
+            # Report rows dropped by the conflict like the ones found up front
+            # (including repeats of a start within this batch)
+            created_starts = {slot["start_time"] for slot in created_slots}
+            skipped_starts = {
+                row["start_time"] for row in new_slot_rows
+                if row["start_time"] not in created_starts or rows_by_start[row["start_time"]] is not row
+            }
+            if skipped_starts:
+                existing_slots.extend(
+                    _existing_slot_summary(slot) for slot in _slots_starting_at(db, user_id, list(skipped_starts))
+                )
         
         # Build appropriate message
         message_parts = []
@@ -497,10 +596,10 @@ def create_availability_slots_bulk(db: Session, user_id: int, slots_data: List[D
             "errors": errors,
             "created_slots": [
                 {
-                    "id": slot.id,
-                    "start_time": slot.start_time.isoformat(),
-                    "end_time": slot.end_time.isoformat(),
-                    "is_available": slot.is_available,
+                    "id": slot["id"],
+                    "start_time": slot["start_time"].isoformat(),
+                    "end_time": slot["end_time"].isoformat(),
+                    "is_available": True,
                     "status": "available"
                 }
                 for slot in created_slots
@@ -508,6 +607,8 @@ def create_availability_slots_bulk(db: Session, user_id: int, slots_data: List[D
         }
         
     except Exception as e:
+        # Nothing from a failed batch is kept; the slots go in together or not at all
+        db.rollback()
         return {
             "success": False,
             "message": f"Error creating slots: {str(e)}",
@@ -608,14 +709,7 @@ class AvailabilityService:
         
         # Check if any of these slots are already booked
         for slot in overlapping_slots:
-            existing_booking = self.db.query(Booking).filter(
-                and_(
-                    Booking.availability_slot_id == slot.id,
-                    Booking.status == "confirmed"
-                )
-            ).first()
-            
-            if existing_booking:
+            if _slot_has_confirmed_booking(self.db, slot.id):
                 return False
         
         return True
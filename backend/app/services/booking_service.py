@@ -1,15 +1,76 @@
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 from datetime import datetime, timezone
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
+from sqlalchemy.orm import Session, load_only
+from sqlalchemy import and_, func
+from googleapiclient.errors import HttpError
 
+from app.core.database import SessionLocal
 from app.models.models import Booking, AvailabilitySlot, User
 from app.schemas.schemas import BookingCreate, BookingUpdate, PublicBookingCreate
-from app.services.availability_service import get_availability_slot, check_slot_availability
+from app.services.availability_service import get_availability_slot, is_slot_bookable
 from app.services.google_calendar_service import GoogleCalendarService
 from app.services.email_service import send_booking_confirmation_email
 
+logger = logging.getLogger(__name__)
+
+# Columns the dashboard and bookings list serialize; summary queries load only these
+BOOKING_SUMMARY_COLUMNS = (
+    Booking.id, Booking.guest_name, Booking.guest_email, Booking.guest_message,
+    Booking.start_time, Booking.end_time, Booking.status, Booking.created_at
+)
+
+# Post-response Google work (confirmation emails, calendar event cleanup) is
+# fire-and-forget; a couple of workers is plenty.
+_background_executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="booking-background")
+# Sends that fail outright (no email went out) are retried with exponential backoff
+_EMAIL_MAX_ATTEMPTS = 3
+_EMAIL_RETRY_BACKOFF_SECONDS = 2
+
+
+def _send_booking_confirmation(
+    booking_id: int,
+    guest_email: str,
+    guest_name: str,
+    host_email: str,
+    host_name: str,
+    host_access_token: Optional[str],
+    host_refresh_token: Optional[str],
+) -> None:
+    """Send booking confirmation emails on a worker thread with its own session."""
+    db = SessionLocal()
+    try:
+        booking = db.get(Booking, booking_id)
+        if not booking:
+            return
+        for attempt in range(1, _EMAIL_MAX_ATTEMPTS + 1):
+            email_sent = send_booking_confirmation_email(
+                guest_email=guest_email,
+                guest_name=guest_name,
+                host_email=host_email,
+                host_name=host_name,
+                booking=booking,
+                host_access_token=host_access_token,
+                host_refresh_token=host_refresh_token,
+                db=db
+            )
+            if email_sent:
+                logger.debug("Booking confirmation emails sent for booking %s", booking_id)
+                return
+            if attempt < _EMAIL_MAX_ATTEMPTS:
+                time.sleep(_EMAIL_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1))
+        logger.warning(
+            "Failed to send booking confirmation emails for booking %s after %s attempts",
+            booking_id, _EMAIL_MAX_ATTEMPTS
+        )
+    except Exception as e:
+        logger.exception("Failed to send confirmation email for booking %s: %s", booking_id, e)
+    finally:
+        db.close()
+
 
 def create_booking(
     db: Session, 
@@ -19,12 +80,9 @@ def create_booking(
 ) -> Optional[Booking]:
     """Create a new booking for a specific availability slot."""
     
-    # Check if slot is available
-    if not check_slot_availability(db, slot_id):
-        return None
-    
+    # Load the slot once and check it is still bookable
     slot = get_availability_slot(db, slot_id)
-    if not slot:
+    if not slot or not is_slot_bookable(db, slot):
         return None
     
     # Create the booking
@@ -60,12 +118,10 @@ def create_booking(
         db.add(db_booking)
         db.commit()
         db.refresh(db_booking)
-        print(f"✅ Booking created successfully: {db_booking.id}")
+        logger.debug("Booking created: %s", db_booking.id)
         
     except Exception as e:
-        print(f"Error creating booking: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error creating booking: %s", e)
         return None
     
     # Now sync to Google Calendar (derived from database)
@@ -83,10 +139,10 @@ def create_booking(
             if slot.google_event_id:
                 try:
                     calendar_service.delete_event(slot.google_event_id)
-                    print(f"Deleted availability slot calendar event: {slot.google_event_id}")
+                    logger.debug("Deleted availability slot calendar event: %s", slot.google_event_id)
                     slot.google_event_id = None  # Clear the slot's calendar event ID
                 except Exception as e:
-                    print(f"Failed to delete availability slot calendar event: {e}")
+                    logger.warning("Failed to delete availability slot calendar event: %s", e)
             
             event_title = f"Meeting with {booking_data.guest_name}"
             event_description = f"Meeting scheduled via booking system.\n\nGuest: {booking_data.guest_name}\nEmail: {booking_data.guest_email}"
@@ -107,42 +163,43 @@ def create_booking(
             # Update database with calendar event ID
             db_booking.google_event_id = google_event_id
             db.commit()
-            print(f"✅ Successfully synced booking {db_booking.id} to Google Calendar")
+            logger.debug("Synced booking %s to Google Calendar", db_booking.id)
             
         except Exception as e:
-            print(f"Failed to create Google Calendar event: {e}")
+            logger.warning("Failed to create Google Calendar event: %s", e)
             # Booking exists in database, calendar sync failed
             # This is acceptable - database is source of truth
     
     # Only send confirmation emails if both database booking and calendar event are created successfully
-    email_sent = False
     if db_booking.id and (google_event_id or not host_user.google_calendar_connected):
-        try:
-            email_sent = send_booking_confirmation_email(
-                guest_email=booking_data.guest_email,
-                guest_name=booking_data.guest_name,
-                host_email=host_user.email,
-                host_name=host_user.full_name,
-                booking=db_booking,
-                host_access_token=host_user.google_access_token,
-                host_refresh_token=host_user.google_refresh_token,
-                db=db
-            )
-            if email_sent:
-                print(f"✅ Booking confirmation emails sent successfully for booking {db_booking.id}")
-            else:
-                print(f"⚠️  Failed to send booking confirmation emails for booking {db_booking.id}")
-        except Exception as e:
-            print(f"Failed to send confirmation email: {e}")
+        # Gmail sends (and any token refresh) run off the request path; the guest
+        # already has their booking and the response shouldn't wait on SMTP/Gmail.
+        _background_executor.submit(
+            _send_booking_confirmation,
+            db_booking.id,
+            booking_data.guest_email,
+            booking_data.guest_name,
+            host_user.email,
+            host_user.full_name,
+            host_user.google_access_token,
+            host_user.google_refresh_token,
+        )
     else:
-        print(f"⚠️  Skipping email confirmation - booking ID: {db_booking.id}, calendar event ID: {google_event_id}")
+        logger.warning("Skipping email confirmation - booking ID: %s, calendar event ID: %s", db_booking.id, google_event_id)
     
     return db_booking
 
 
-def get_bookings_for_user(db: Session, user_id: int, status: str = None) -> List[Booking]:
-    """Get all bookings for a user (as host)."""
+def get_bookings_for_user(
+    db: Session, user_id: int, status: str = None, summary_only: bool = False
+) -> List[Booking]:
+    """Get all bookings for a user (as host).
+
+    With summary_only, only BOOKING_SUMMARY_COLUMNS are selected.
+    """
     query = db.query(Booking).filter(Booking.host_user_id == user_id)
+    if summary_only:
+        query = query.options(load_only(*BOOKING_SUMMARY_COLUMNS))
     
     if status:
         query = query.filter(Booking.status == status)
@@ -150,6 +207,11 @@ def get_bookings_for_user(db: Session, user_id: int, status: str = None) -> List
     return query.order_by(Booking.start_time.desc()).all()
 
 
+def count_bookings_for_user(db: Session, user_id: int) -> int:
+    """Count all bookings for a user (as host) without loading them."""
+    return db.query(func.count(Booking.id)).filter(Booking.host_user_id == user_id).scalar()
+
+
 def get_booking(db: Session, booking_id: int, user_id: int = None) -> Optional[Booking]:
     """Get a specific booking."""
     query = db.query(Booking).filter(Booking.id == booking_id)
@@ -166,15 +228,25 @@ def update_booking(
     booking_update: BookingUpdate, 
     user_id: int,
     update_calendar: bool = True) -> Optional[Booking]:
-    """Update a booking."""
+    """Update a booking.
+
+    The field changes and any calendar follow-up land in a single commit.
+    """
     booking = get_booking(db, booking_id, user_id)
     if not booking:
         return None
     
+    update_data = booking_update.dict(exclude_unset=True)
+    original_start_time = booking.start_time
+    original_end_time = booking.end_time
+    for key, value in update_data.items():
+        setattr(booking, key, value)
+    
     # Handle Google Calendar updates only if requested
     if update_calendar and booking.google_event_id:
         try:
-            host = db.query(User).filter(User.id == booking.host_user_id).first()
+            # The host is usually the authenticated user, already in this session
+            host = db.get(User, booking.host_user_id)
             if host and host.google_access_token and host.google_refresh_token:
                 calendar_service = GoogleCalendarService(
                     access_token=host.google_access_token,
@@ -186,58 +258,102 @@ def update_booking(
                 # If status is being changed to cancelled, delete the event
                 if update_data.get('status') == 'cancelled':
                     calendar_service.delete_event(booking.google_event_id)
-                    print(f"Deleted Google Calendar event: {booking.google_event_id}")
+                    logger.debug("Deleted Google Calendar event: %s", booking.google_event_id)
                 
                 # If times are being updated, update the event
                 elif (update_data.get('start_time') and update_data.get('end_time') and 
                       (booking.start_time != original_start_time or booking.end_time != original_end_time)):
-                    calendar_service.update_event(
-                        event_id=booking.google_event_id,
-                        start_time=booking.start_time,
-                        end_time=booking.end_time
-                    )
-                    print(f"Updated Google Calendar event: {booking.google_event_id}")
+                    # Patch the event directly rather than probing for it first; only
+                    # when it has gone missing is a replacement created
+                    try:
+                        calendar_service.update_event(
+                            event_id=booking.google_event_id,
+                            start_time=booking.start_time,
+                            end_time=booking.end_time
+                        )
+                        logger.debug("Updated Google Calendar event: %s", booking.google_event_id)
+                    except HttpError as e:
+                        if e.resp.status not in (404, 410):
+                            raise
+                        created_event = calendar_service.create_booking_event(
+                            title=f"Meeting with {booking.guest_name}",
+                            start_time=booking.start_time,
+                            end_time=booking.end_time,
+                            guest_email=booking.guest_email,
+                            host_email=host.email,
+                            description=booking.guest_message
+                        )
+                        booking.google_event_id = created_event.get('id')
+                        logger.debug("Recreated missing Google Calendar event: %s", booking.google_event_id)
                     
         except Exception as e:
-            print(f"Failed to update Google Calendar event: {e}")
-            # Continue with booking update even if calendar update fails    
-    db.commit()
+            logger.warning("Failed to update Google Calendar event: %s", e)
+            # Continue with booking update even if calendar update fails
+    
+    try:
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
     db.refresh(booking)
     return booking
 
 
-def cancel_booking(db: Session, booking_id: int, user_id: int = None) -> bool:
-    """Cancel a booking."""
+def cancel_booking(db: Session, booking_id: int, user_id: int = None) -> Optional[Booking]:
+    """Cancel a booking.
+
+    Returns the cancelled booking, or None if it wasn't found. Only the status is
+    committed here; the Google Calendar event is removed on the background
+    executor, so the caller doesn't wait on the calendar API.
+    """
     booking = get_booking(db, booking_id, user_id)
     if not booking:
-        return False
+        return None
     
     booking.status = "cancelled"
-    
-    # Try to delete the Google Calendar event
-    if booking.google_event_id:
-        try:
-            host = db.query(User).filter(User.id == booking.host_user_id).first()
-            if host and host.google_access_token and host.google_refresh_token:
-                calendar_service = GoogleCalendarService(
-                    access_token=host.google_access_token,
-                    refresh_token=host.google_refresh_token,
-                    db=db,
-                    user_id=host.id
-                )
-                calendar_service.delete_event(booking.google_event_id)
-        except Exception as e:
-            print(f"Failed to delete Google Calendar event: {e}")
-    
+    # Read what the cleanup needs before the commit expires the instance
+    host_user_id, google_event_id = booking.host_user_id, booking.google_event_id
     db.commit()
-    return True
+    
+    # Removing the calendar event (and Google's cancellation notice to attendees)
+    # happens off the request path; the cancellation itself is already committed
+    if google_event_id:
+        _background_executor.submit(_delete_booking_calendar_event, host_user_id, google_event_id)
+    return booking
+
+
+def _delete_booking_calendar_event(host_user_id: int, google_event_id: str) -> None:
+    """Delete a booking's Google Calendar event using a session of its own."""
+    db = SessionLocal()
+    try:
+        host = db.get(User, host_user_id)
+        if host and host.google_access_token and host.google_refresh_token:
+            calendar_service = GoogleCalendarService(
+                access_token=host.google_access_token,
+                refresh_token=host.google_refresh_token,
+                db=db,
+                user_id=host.id
+            )
+            calendar_service.delete_event(google_event_id)
+    except Exception as e:
+        logger.warning("Failed to delete Google Calendar event: %s", e)
+    finally:
+        db.close()
+
 
+def get_upcoming_bookings(
+    db: Session, user_id: int, limit: int = 10, summary_only: bool = False
+) -> List[Booking]:
+    """Get upcoming bookings for a user.
 
-def get_upcoming_bookings(db: Session, user_id: int, limit: int = 10) -> List[Booking]:
-    """Get upcoming bookings for a user."""
+    With summary_only, only BOOKING_SUMMARY_COLUMNS are selected.
+    """
     now = datetime.now(timezone.utc)
+    query = db.query(Booking)
+    if summary_only:
+        query = query.options(load_only(*BOOKING_SUMMARY_COLUMNS))
     return (
-        db.query(Booking)
+        query
         .filter(
             and_(
                 Booking.host_user_id == user_id,
@@ -55,7 +55,6 @@ def send_booking_confirmation_email(
     # If we have a database session, try to refresh tokens automatically
     if db:
         try:
-            from app.services.token_refresh_service import get_token_refresh_service
             token_service = get_token_refresh_service(db)
             
             # Get the host user
@@ -75,11 +74,20 @@ def send_booking_confirmation_email(
         except Exception as e:
             print(f"Token refresh error: {e}")
     
+    # Both emails go out through one Gmail client, so the second send reuses the
+    # first one's connection instead of building a new client
+    gmail_service = None
+    if host_access_token and host_refresh_token:
+        try:
+            gmail_service = GmailService(host_access_token, host_refresh_token)
+        except Exception as e:
+            print(f"Gmail client error: {e}")
+    
     # Send confirmation to guest
-    guest_email_sent = send_guest_confirmation_email(guest_email, guest_name, host_name, booking, host_access_token, host_refresh_token)
+    guest_email_sent = send_guest_confirmation_email(guest_email, guest_name, host_name, booking, host_access_token, host_refresh_token, gmail_service=gmail_service)
     
     # Send notification to host
-    host_email_sent = send_host_notification_email(host_email, host_name, guest_name, guest_email, booking, host_access_token, host_refresh_token)
+    host_email_sent = send_host_notification_email(host_email, host_name, guest_name, guest_email, booking, host_access_token, host_refresh_token, gmail_service=gmail_service)
     
     # Return success if at least one email was sent
     return guest_email_sent or host_email_sent
@@ -90,13 +98,14 @@ def send_guest_confirmation_email(
     host_name: str,
     booking: "Booking",
     host_access_token: str = None,
-    host_refresh_token: str = None
+    host_refresh_token: str = None,
+    gmail_service: Optional[GmailService] = None
 ):
     """Send booking confirmation email to the guest."""
     try:
         # Use Gmail API if tokens are available
         if host_access_token and host_refresh_token:
-            gmail_service = GmailService(host_access_token, host_refresh_token)
+            gmail_service = gmail_service or GmailService(host_access_token, host_refresh_token)
             
             html_body = f"""
             <html>
@@ -141,13 +150,14 @@ def send_host_notification_email(
     guest_email: str,
     booking: "Booking",
     host_access_token: str = None,
-    host_refresh_token: str = None
+    host_refresh_token: str = None,
+    gmail_service: Optional[GmailService] = None
 ):
     """Send booking notification email to the host."""
     try:
         # Use Gmail API if tokens are available
         if host_access_token and host_refresh_token:
-            gmail_service = GmailService(host_access_token, host_refresh_token)
+            gmail_service = gmail_service or GmailService(host_access_token, host_refresh_token)
             
             html_body = f"""
             <html>
@@ -1,15 +1,26 @@
+import logging
 import os
 from datetime import datetime, timedelta, timezone
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple
 
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 
 from app.core.calendar_architecture import BaseCalendarProvider, CalendarProviderType
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# Longest window sent in one freeBusy query; Google rejects overly long ranges
+FREEBUSY_MAX_RANGE = timedelta(days=30)
+
+
+class FreeBusyError(Exception):
+    """freeBusy couldn't report busy time for a calendar, so its availability is unknown."""
+
 
 class GoogleCalendarService(BaseCalendarProvider):
     def __init__(self, access_token: str = None, refresh_token: str = None, db: Optional[Any] = None, user_id: Optional[int] = None):
@@ -17,6 +28,8 @@ class GoogleCalendarService(BaseCalendarProvider):
         super().__init__(access_token=access_token, refresh_token=refresh_token, db=db, user_id=user_id)
         
         self.credentials = None
+        self._service = None
+        self._service_credentials = None
         
         if access_token and refresh_token:
             self.credentials = Credentials(
@@ -94,6 +107,15 @@ class GoogleCalendarService(BaseCalendarProvider):
             "refresh_token": self.credentials.refresh_token,
         }
 
+    def _get_service(self):
+        """Return the Calendar API client, rebuilt only when the credentials change."""
+        # Building the client parses the discovery document; reuse it across calls
+        # (and across a batch of bookings) until a token refresh swaps the credentials
+        if self._service is None or self._service_credentials is not self.credentials:
+            self._service = build('calendar', 'v3', credentials=self.credentials)
+            self._service_credentials = self.credentials
+        return self._service
+
     def _ensure_valid_credentials(self):
         """Ensure credentials are valid and refresh if needed."""
         if not self.credentials:
@@ -106,8 +128,8 @@ class GoogleCalendarService(BaseCalendarProvider):
         from app.services.token_refresh_service import TokenRefreshService
         from app.models.models import User
         
-        # Get user from database
-        user = self.db.query(User).filter(User.id == self.user_id).first()
+        # Get user from database (usually already in the session's identity map)
+        user = self.db.get(User, self.user_id)
         if not user:
             raise Exception("User not found")
         
@@ -116,6 +138,12 @@ class GoogleCalendarService(BaseCalendarProvider):
         result = token_service.ensure_valid_tokens(user)
         
         if result["success"]:
+            # Keep the current credentials (and the API client built on them)
+            # unless the tokens actually changed
+            if (result["access_token"] == self.credentials.token
+                    and result["refresh_token"] == self.credentials.refresh_token):
+                return
+            
             # Update credentials with new tokens
             self.credentials = Credentials(
                 token=result["access_token"],
@@ -130,38 +158,21 @@ class GoogleCalendarService(BaseCalendarProvider):
                 ],
             )
         else:
-            print(f"[GOOGLE CALENDAR] Token refresh failed: {result['message']}")
+            logger.warning("Token refresh failed: %s", result['message'])
             # Don't raise exception, just log the error and continue with existing credentials
             # This allows the sync to continue even if token refresh fails
             return
 
     def check_availability(self, start_time: datetime, end_time: datetime) -> bool:
         """Check if a time slot is available (no conflicting events)."""
-        self._ensure_valid_credentials()
-        service = build('calendar', 'v3', credentials=self.credentials)
-        
         # Ensure datetime objects are timezone-aware
         if start_time.tzinfo is None:
             start_time = start_time.replace(tzinfo=timezone.utc)
         if end_time.tzinfo is None:
             end_time = end_time.replace(tzinfo=timezone.utc)
         
-        # Get events that overlap with the requested time slot
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=start_time.isoformat(),
-            timeMax=end_time.isoformat(),
-            singleEvents=True
-        ).execute()
-        
-        events = events_result.get('items', [])        
-        # Filter out events that are marked as 'transparent' (free time)
-        conflicting_events = [
-            event for event in events 
-            if event.get('transparency', 'opaque') != 'transparent'
-        ]
-        
-        return len(conflicting_events) == 0
+        # Google reports busy time only (transparent events are already left out)
+        return not self.get_busy_intervals(start_time, end_time)
 
     def get_events(self, start_date: Optional[datetime] = None, end_date: Optional[datetime] = None) -> List[Dict[str, Any]]:
         """
@@ -177,7 +188,7 @@ class GoogleCalendarService(BaseCalendarProvider):
         try:
             self._ensure_valid_credentials()
             
-            service = build('calendar', 'v3', credentials=self.credentials)
+            service = self._get_service()
             
             # Set default date range if not provided
             if start_date is None:
@@ -196,7 +207,7 @@ class GoogleCalendarService(BaseCalendarProvider):
             start_date_str = start_date.isoformat()
             end_date_str = end_date.isoformat()
             
-            print(f"[GOOGLE CALENDAR] Fetching events from {start_date_str} to {end_date_str}")
+            logger.debug("Fetching events from %s to %s", start_date_str, end_date_str)
             
             events_result = service.events().list(
                 calendarId='primary',
@@ -207,22 +218,130 @@ class GoogleCalendarService(BaseCalendarProvider):
             ).execute()
             
             events = events_result.get('items', [])
-            print(f"[GOOGLE CALENDAR] Found {len(events)} events")
+            logger.debug("Found %d events", len(events))
             
             return events
             
         except Exception as e:
-            print(f"[GOOGLE CALENDAR ERROR] Failed to get events: {str(e)}")
+            logger.error("Failed to get events: %s", e)
             # Check if it's a network/SSL error
             if "SSL" in str(e) or "EOF" in str(e) or "Max retries" in str(e):
-                print(f"[GOOGLE CALENDAR] Network error detected, will retry later")
+                logger.warning("Network error detected, will retry later")
             return []
 
-    def get_available_slots(self, date, duration_minutes: int = 30) -> list:
-        """Get available time slots for a given date."""
+    def get_events_incremental(self, sync_token: Optional[str] = None, start_date: Optional[datetime] = None,
+                               end_date: Optional[datetime] = None) -> Dict[str, Any]:
+        """
+        Get events changed since the last sync using Google's incremental sync.
+
+        Args:
+            sync_token: nextSyncToken from a previous call (None for a full sync)
+            start_date: Start of the full-sync window (defaults to 7 days ago)
+            end_date: End of the full-sync window (defaults to 7 days from now)
+
+        Returns:
+            Dict with the changed 'events' and the 'next_sync_token' to store
+        """
+        self._ensure_valid_credentials()
+
+        service = self._get_service()
+
+        # syncToken cannot be combined with timeMin/timeMax, so the window only
+        # applies to the initial (full) sync
+        params = {'calendarId': 'primary', 'singleEvents': True}
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            if start_date is None:
+                start_date = datetime.now(timezone.utc) - timedelta(days=7)
+            if end_date is None:
+                end_date = datetime.now(timezone.utc) + timedelta(days=7)
+            if start_date.tzinfo is None:
+                start_date = start_date.replace(tzinfo=timezone.utc)
+            if end_date.tzinfo is None:
+                end_date = end_date.replace(tzinfo=timezone.utc)
+            params['timeMin'] = start_date.isoformat()
+            params['timeMax'] = end_date.isoformat()
+
+        events = []
+        page_token = None
+        while True:
+            try:
+                events_result = service.events().list(pageToken=page_token, **params).execute()
+            except HttpError as e:
+                if sync_token and e.resp.status == 410:
+                    # Sync token expired - fall back to a full sync
+                    logger.info("Sync token expired, performing full sync")
+                    return self.get_events_incremental(None, start_date, end_date)
+                raise
+
+            events.extend(events_result.get('items', []))
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
+
+        logger.debug("Found %d changed events", len(events))
+
+        return {
+            'events': events,
+            'next_sync_token': events_result.get('nextSyncToken')
+        }
+
+    def get_busy_intervals(
+        self,
+        start_time: datetime,
+        end_time: datetime,
+        calendar_ids: Optional[List[str]] = None
+    ) -> List[Tuple[datetime, datetime]]:
+        """Get busy (start, end) intervals across calendars from the freeBusy API.
+
+        One query covers every calendar in the window, so Google computes the busy
+        time instead of us listing and filtering each event. Windows longer than
+        FREEBUSY_MAX_RANGE are split into consecutive queries. Raises FreeBusyError
+        if any calendar reports errors instead of busy time.
+        """
         self._ensure_valid_credentials()
-        service = build('calendar', 'v3', credentials=self.credentials)
+        service = self._get_service()
         
+        if start_time.tzinfo is None:
+            start_time = start_time.replace(tzinfo=timezone.utc)
+        if end_time.tzinfo is None:
+            end_time = end_time.replace(tzinfo=timezone.utc)
+        items = [{'id': calendar_id} for calendar_id in (calendar_ids or ['primary'])]
+        
+        busy_intervals = []
+        chunk_start = start_time
+        while chunk_start < end_time:
+            chunk_end = min(chunk_start + FREEBUSY_MAX_RANGE, end_time)
+            result = service.freebusy().query(body={
+                'timeMin': chunk_start.isoformat(),
+                'timeMax': chunk_end.isoformat(),
+                'items': items,
+            }).execute()
+            for calendar_id, calendar in result.get('calendars', {}).items():
+                # A calendar with errors has no busy list; never read that as free time
+                if calendar.get('errors'):
+                    raise FreeBusyError(f"freeBusy failed for calendar {calendar_id}: {calendar['errors']}")
+                for busy in calendar.get('busy', []):
+                    busy_intervals.append((
+                        datetime.fromisoformat(busy['start']),
+                        datetime.fromisoformat(busy['end'])
+                    ))
+            chunk_start = chunk_end
+        
+        return busy_intervals
+
+    def get_available_slots(
+        self,
+        date,
+        duration_minutes: int = 30,
+        busy_intervals: Optional[List[Tuple[datetime, datetime]]] = None
+    ) -> list:
+        """Get available time slots for a given date.
+
+        Callers covering several days can pass busy_intervals fetched once for the
+        whole range; otherwise the day's busy time is queried here.
+        """
         # Define business hours (9 AM to 5 PM)
         start_hour = 9
         end_hour = 17
@@ -238,58 +357,39 @@ class GoogleCalendarService(BaseCalendarProvider):
         day_start = date.replace(hour=start_hour, minute=0, second=0, microsecond=0)
         day_end = date.replace(hour=end_hour, minute=0, second=0, microsecond=0)
         
-        # Get all events for the day
-        events_result = service.events().list(
-            calendarId='primary',
-            timeMin=day_start.isoformat(),
-            timeMax=day_end.isoformat(),
-            singleEvents=True,
-            orderBy='startTime'
-        ).execute()
-        
-        events = events_result.get('items', [])
-        
-        # Filter out transparent events (free time)
-        busy_events = [
-            event for event in events 
-            if event.get('transparency', 'opaque') != 'transparent'
-        ]
+        if busy_intervals is None:
+            busy_intervals = self.get_busy_intervals(day_start, day_end)
+        else:
+            # Keep only the intervals touching this day before checking each slot
+            busy_intervals = [
+                (busy_start, busy_end) for busy_start, busy_end in busy_intervals
+                if busy_start < day_end and busy_end > day_start
+            ]
         
         # Generate available slots
         available_slots = []
-        current_time = day_start
+        duration = timedelta(minutes=duration_minutes)
+        step = timedelta(minutes=30)
+        
+        # Number of 30-minute starts whose slot still ends by day_end
+        window = day_end - day_start
+        slot_count = (window - duration) // step + 1 if duration <= window else 0
         
-        while current_time + timedelta(minutes=duration_minutes) <= day_end:
-            slot_end = current_time + timedelta(minutes=duration_minutes)
+        for i in range(slot_count):
+            current_time = day_start + i * step
+            slot_end = current_time + duration
             
-            # Check if this slot conflicts with any busy events
-            is_available = True
-            for event in busy_events:
-                # Parse event times and ensure they're timezone-aware
-                event_start_str = event['start'].get('dateTime', event['start'].get('date'))
-                event_end_str = event['end'].get('dateTime', event['end'].get('date'))
-                
-                # Handle both dateTime and date formats
-                if 'T' in event_start_str:  # dateTime format
-                    event_start = datetime.fromisoformat(event_start_str.replace('Z', '+00:00'))
-                    event_end = datetime.fromisoformat(event_end_str.replace('Z', '+00:00'))
-                else:  # date format (all-day events)
-                    event_start = datetime.fromisoformat(event_start_str).replace(tzinfo=timezone.utc)
-                    event_end = datetime.fromisoformat(event_end_str).replace(tzinfo=timezone.utc)
-                
-                # Check for overlap
-                if (current_time < event_end and slot_end > event_start):
-                    is_available = False
-                    break
+            # Check if this slot overlaps any busy interval
+            is_available = not any(
+                current_time < event_end and slot_end > event_start
+                for event_start, event_end in busy_intervals
+            )
             
             if is_available:
                 available_slots.append({
                     'start_time': current_time,
                     'end_time': slot_end
                 })
-            
-            # Move to next slot (30-minute intervals)
-            current_time += timedelta(minutes=30)
         
         return available_slots
 
@@ -297,7 +397,7 @@ class GoogleCalendarService(BaseCalendarProvider):
         """Create a calendar event with the provided event data."""
         self._ensure_valid_credentials()
         
-        service = build('calendar', 'v3', credentials=self.credentials)
+        service = self._get_service()
         
         try:
             created_event = service.events().insert(calendarId='primary', body=event_data, sendUpdates='none').execute()
@@ -305,6 +405,70 @@ class GoogleCalendarService(BaseCalendarProvider):
         except Exception as e:
             self._handle_google_api_error(e)
 
+    def create_events_batch(self, events_data: List[Dict[str, Any]], batch_size: int = 50) -> List[Optional[Dict[str, Any]]]:
+        """
+        Create several calendar events using batched API requests.
+
+        Args:
+            events_data: Event bodies to insert
+            batch_size: Number of inserts sent per HTTP request
+
+        Returns:
+            Created events in the same order as events_data (None where an insert failed)
+        """
+        self._ensure_valid_credentials()
+
+        service = self._get_service()
+        created_events: List[Optional[Dict[str, Any]]] = [None] * len(events_data)
+
+        def handle_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("Batch insert %s failed: %s", request_id, exception)
+                return
+            created_events[int(request_id)] = response
+
+        for batch_start in range(0, len(events_data), batch_size):
+            batch = service.new_batch_http_request(callback=handle_response)
+            for index in range(batch_start, min(batch_start + batch_size, len(events_data))):
+                batch.add(
+                    service.events().insert(calendarId='primary', body=events_data[index], sendUpdates='none'),
+                    request_id=str(index)
+                )
+            batch.execute()
+
+        return created_events
+
+    def delete_events_batch(self, event_ids: List[str], batch_size: int = 50) -> Dict[str, bool]:
+        """
+        Delete several calendar events using batched API requests.
+
+        Args:
+            event_ids: Google Calendar event IDs to delete
+            batch_size: Number of deletes sent per HTTP request
+
+        Returns:
+            Mapping of event ID to whether its delete succeeded
+        """
+        self._ensure_valid_credentials()
+
+        service = self._get_service()
+        deleted = {event_id: False for event_id in event_ids}
+
+        def handle_response(request_id, response, exception):
+            if exception is not None:
+                logger.error("Failed to delete event %s: %s", request_id, exception)
+                return
+            deleted[request_id] = True
+
+        unique_ids = list(deleted)
+        for batch_start in range(0, len(unique_ids), batch_size):
+            batch = service.new_batch_http_request(callback=handle_response)
+            for event_id in unique_ids[batch_start:batch_start + batch_size]:
+                batch.add(service.events().delete(calendarId='primary', eventId=event_id), request_id=event_id)
+            batch.execute()
+
+        return deleted
+
     def create_booking_event(        self,
         title: str,
         start_time: datetime,
@@ -317,7 +481,7 @@ class GoogleCalendarService(BaseCalendarProvider):
         """Create a calendar event for a booking."""
         self._ensure_valid_credentials()
         
-        service = build('calendar', 'v3', credentials=self.credentials)
+        service = self._get_service()
         
         # Ensure datetime objects are timezone-aware
         if start_time.tzinfo is None:
@@ -370,17 +534,13 @@ class GoogleCalendarService(BaseCalendarProvider):
     ) -> Dict[str, Any]:
         """Update an existing calendar event."""
         try:
-            print(f"[GOOGLE CALENDAR] Updating event: {event_id}")
+            logger.debug("Updating event: %s", event_id)
             self._ensure_valid_credentials()
             
-            service = build('calendar', 'v3', credentials=self.credentials)
-            
-            # Get the existing event
-            print(f"[GOOGLE CALENDAR] Getting existing event: {event_id}")
-            event = service.events().get(calendarId='primary', eventId=event_id).execute()
-            print(f"[GOOGLE CALENDAR] Retrieved existing event")
+            service = self._get_service()
             
-            # Update fields if provided
+            # Patch only the changed fields; this saves fetching the event first
+            event = {}
             if title:
                 event['summary'] = title
             if description:
@@ -395,7 +555,6 @@ class GoogleCalendarService(BaseCalendarProvider):
                     'dateTime': start_time.isoformat(),
                     'timeZone': 'UTC',
                 }
-                print(f"[GOOGLE CALENDAR] Updated start time: {start_time.isoformat()}")
             if end_time:
                 # Ensure datetime object is timezone-aware
                 if end_time.tzinfo is None:
@@ -404,20 +563,18 @@ class GoogleCalendarService(BaseCalendarProvider):
                     'dateTime': end_time.isoformat(),
                     'timeZone': 'UTC',
                 }
-                print(f"[GOOGLE CALENDAR] Updated end time: {end_time.isoformat()}")
             
-            print(f"[GOOGLE CALENDAR] Updating event in calendar...")
-            updated_event = service.events().update(
+            updated_event = service.events().patch(
                 calendarId='primary', 
                 eventId=event_id, 
                 body=event,
                 sendUpdates='all'
             ).execute()
-            print(f"[GOOGLE CALENDAR] Successfully updated event: {event_id}")
+            logger.debug("Successfully updated event: %s", event_id)
             return updated_event
             
         except Exception as e:
-            print(f"[GOOGLE CALENDAR ERROR] Error updating event {event_id}: {e}")
+            logger.error("Error updating event %s: %s", event_id, e)
             self._handle_google_api_error(e)
             raise
     def delete_event(self, event_id: str) -> bool:
@@ -425,18 +582,18 @@ class GoogleCalendarService(BaseCalendarProvider):
         try:
             self._ensure_valid_credentials()
             
-            service = build('calendar', 'v3', credentials=self.credentials)
+            service = self._get_service()
             
             service.events().delete(
                 calendarId='primary',
                 eventId=event_id
             ).execute()
             
-            print(f"[GOOGLE CALENDAR] Deleted event {event_id}")
+            logger.debug("Deleted event %s", event_id)
             return True
             
         except Exception as e:
-            print(f"[GOOGLE CALENDAR ERROR] Failed to delete event {event_id}: {str(e)}")
+            logger.error("Failed to delete event %s: %s", event_id, e)
             return False
 
     def get_event(self, event_id: str) -> Optional[Dict[str, Any]]:
@@ -444,7 +601,7 @@ class GoogleCalendarService(BaseCalendarProvider):
         try:
             self._ensure_valid_credentials()
             
-            service = build('calendar', 'v3', credentials=self.credentials)
+            service = self._get_service()
             
             event = service.events().get(
                 calendarId='primary',
@@ -454,7 +611,7 @@ class GoogleCalendarService(BaseCalendarProvider):
             return event
             
         except Exception as e:
-            print(f"[GOOGLE CALENDAR ERROR] Failed to get event {event_id}: {str(e)}")
+            logger.error("Failed to get event %s: %s", event_id, e)
             return None
 
     def _get_provider_type(self):
@@ -464,12 +621,12 @@ class GoogleCalendarService(BaseCalendarProvider):
 
     def _handle_google_api_error(self, error):
         """Handle Google API errors."""
-        print(f"[GOOGLE CALENDAR ERROR] Google API Error: {error}")
+        logger.error("Google API Error: %s", error)
         if hasattr(error, 'resp') and error.resp.status == 401:
-            print("[GOOGLE CALENDAR] Token expired, attempting refresh...")
+            logger.info("Token expired, attempting refresh...")
             try:
                 self._ensure_valid_credentials()
             except Exception as refresh_error:
-                print(f"[GOOGLE CALENDAR ERROR] Token refresh failed: {refresh_error}")
+                logger.error("Token refresh failed: %s", refresh_error)
         raise error
 
@@ -1,4 +1,5 @@
 from typing import Dict, Any, List, Optional
+import asyncio
 from sqlalchemy.orm import Session
 import json
 import logging
@@ -54,6 +55,10 @@ class IntelligentAgentService:
     
     def _initialize_calendar_service(self, user_id: int):
         """Initialize calendar service for a specific user"""
+        # Reuse the service from an earlier message for the same user instead of
+        # re-querying the user and rebuilding the Google client
+        if self.calendar_service is not None and self.calendar_service.user_id == user_id:
+            return
         try:
             self.calendar_service = LLMCalendarService(self.db, user_id)
             logger.info(f"Calendar service initialized for user {user_id}")
@@ -107,26 +112,38 @@ class IntelligentAgentService:
             extracted_info = self.ai_agent._analyze_message(message, context)
             
             # Step 1.5: LLM Intent Analysis (ENABLED with better integration)
+            # Start the LLM round-trip now so it overlaps with the local knowledge lookups below
+            llm_intent_task = None
             if self.llm_service:
+                logger.info("Attempting LLM intent analysis...")
+                llm_intent_task = asyncio.create_task(self.llm_service.analyze_intent(message, context))
+            else:
+                logger.warning("LLM service not available, using rule-based analysis only")
+            
+            # Step 2: Retrieve relevant knowledge (blocking DB work, in a thread so
+            # the intent request can make progress meanwhile)
+            try:
+                relevant_knowledge = await asyncio.to_thread(
+                    self.knowledge_base.get_relevant_knowledge, message, user_id, context
+                )
+            except BaseException:
+                # Don't leave the LLM request running (and its result unretrieved)
+                if llm_intent_task:
+                    llm_intent_task.cancel()
+                raise
+            
+            # Step 3: Get user patterns for personalization (already loaded above)
+            user_patterns = context["user_patterns"]
+            
+            if llm_intent_task:
                 try:
-                    logger.info("Attempting LLM intent analysis...")
-                    llm_intent_analysis = await self.llm_service.analyze_intent(message, context)
+                    llm_intent_analysis = await llm_intent_task
                     logger.info(f"LLM intent analysis successful: {llm_intent_analysis}")
                     # Merge LLM analysis with rule-based analysis (but prioritize our logic)
                     extracted_info = self._merge_intent_analysis(extracted_info, llm_intent_analysis)
                 except Exception as e:
                     logger.warning(f"LLM analysis failed, using rule-based only: {e}")
                     # Continue with rule-based analysis only
-            else:
-                logger.warning("LLM service not available, using rule-based analysis only")
-            
-            # Step 2: Retrieve relevant knowledge
-            relevant_knowledge = self.knowledge_base.get_relevant_knowledge(
-                message, user_id, context
-            )
-            
-            # Step 3: Get user patterns for personalization
-            user_patterns = self.knowledge_base.get_user_patterns(user_id)
             
             # Step 4: Enhance context with knowledge and patterns
             enhanced_context = self._enhance_context_with_knowledge(
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional
 import os
+import functools
 import logging
 import json
 
@@ -300,6 +301,22 @@ Be efficient and get things done!"""
         
         return base_prompt
 
+@functools.lru_cache(maxsize=None)
+def _get_shared_provider(provider_name: str) -> LLMProvider:
+    """
+    Build each provider once per process.
+    
+    LLMService is created per request; sharing the provider keeps its HTTP
+    client (and pooled TLS connections) alive across requests.
+    """
+    if provider_name == "openai":
+        return OpenAIProvider()
+    elif provider_name == "claude":
+        return ClaudeProvider()
+    else:
+        # Default to OpenAI
+        return _get_shared_provider("openai")
+
 class LLMService:
     """Service for managing LLM providers"""
     
@@ -315,13 +332,7 @@ class LLMService:
     
     def _get_provider(self) -> LLMProvider:
         """Get the appropriate LLM provider"""
-        if self.provider_name.lower() == "openai":
-            return OpenAIProvider()
-        elif self.provider_name.lower() == "claude":
-            return ClaudeProvider()
-        else:
-            # Default to OpenAI
-            return OpenAIProvider()
+        return _get_shared_provider(self.provider_name.lower())
     
     async def generate_response(self, prompt: str, context: Dict[str, Any] = None) -> str:
         """Generate response using current provider"""
@@ -5,6 +5,17 @@ from datetime import datetime
 
 from app.core.config import settings
 
+# Shared HTTP session so OAuth token exchanges reuse pooled keep-alive connections
+_http_session = requests.Session()
+_http_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=50))
+GOOGLE_REQUEST_TIMEOUT = 10  # seconds
+
+REQUIRED_CALENDAR_SCOPES = frozenset({
+    "https://www.googleapis.com/auth/calendar",
+    "https://www.googleapis.com/auth/calendar.events",
+    "https://www.googleapis.com/auth/calendar.readonly"
+})
+
 
 class GoogleOAuthService:
     """Service to handle Google OAuth flows with proper scopes."""
@@ -59,7 +70,7 @@ class GoogleOAuthService:
         }
         headers = {"Content-Type": "application/x-www-form-urlencoded"}
         
-        response = requests.post(token_url, data=token_data, headers=headers)
+        response = _http_session.post(token_url, data=token_data, headers=headers, timeout=GOOGLE_REQUEST_TIMEOUT)
         response.raise_for_status()
         
         tokens = response.json()
@@ -76,21 +87,14 @@ class GoogleOAuthService:
         user_info_url = "https://www.googleapis.com/oauth2/v2/userinfo"
         headers = {"Authorization": f"Bearer {access_token}"}
         
-        response = requests.get(user_info_url, headers=headers)
+        response = _http_session.get(user_info_url, headers=headers, timeout=GOOGLE_REQUEST_TIMEOUT)
         response.raise_for_status()
         
         return response.json()
     
     def validate_calendar_scopes(self, scope: str) -> bool:
         """Check if the received scope includes calendar permissions."""
-        required_scopes = [
-            "https://www.googleapis.com/auth/calendar",
-            "https://www.googleapis.com/auth/calendar.events",
-            "https://www.googleapis.com/auth/calendar.readonly"
-        ]
-        
-        scope_list = scope.split()
-        return all(required_scope in scope_list for required_scope in required_scopes)
+        return REQUIRED_CALENDAR_SCOPES.issubset(scope.split())
 
 
 def get_oauth_service() -> GoogleOAuthService:
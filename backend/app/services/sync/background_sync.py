@@ -1,18 +1,25 @@
 """
 Background Sync Service - Periodic synchronization with calendar providers.
 This module handles background sync jobs to keep database and external calendars in sync.
+
+Calendar provider calls are synchronous (Google API client) and must be run
+with asyncio.to_thread from the async methods here, never called directly.
 """
 
 import asyncio
 import logging
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+import random
+import time
+from typing import List, Dict, Any, Optional, Tuple
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
-from app.core.database import get_db, check_db_connection
+from app.core.database import SessionLocal, check_db_connection
 from app.models.models import Booking, User
 from app.core.calendar_architecture import CalendarSyncService, create_calendar_provider, CalendarProviderType
 from app.core.sync_config import get_sync_config
+from app.services.google_calendar_service import GoogleCalendarService
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -24,10 +31,15 @@ class BackgroundSyncService:
     Maintains existing functionality while adding automated sync capabilities.
     """
     
+    # Whether Booking maps sync tracking columns - fixed by the model, so checked once
+    _sync_columns_exist: bool = 'sync_status' in Booking.__table__.columns
+    
     def __init__(self):
         """Initialize the background sync service."""
         self.sync_config = get_sync_config()
         self.is_running = False
+        self._wake_event = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
     
     async def start_periodic_sync(self) -> None:
         """
@@ -37,6 +49,10 @@ class BackgroundSyncService:
         1. Failed syncs that need retry
         2. New bookings that haven't been synced
         3. Updated bookings that need re-sync
+        
+        Cycles run at a fixed rate with random jitter. Ticks missed by a long
+        cycle are coalesced into a single run, and trigger_now() starts the
+        next cycle early.
         """
         if self.is_running:
             print("[SYNC] Background sync service is already running")
@@ -47,12 +63,27 @@ class BackgroundSyncService:
         print("[SYNC] Starting background sync service...")
         logger.info("Starting background sync service")
         
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        next_run = loop.time()
+        
         try:
             while self.is_running:
                 print(f"[SYNC] Starting sync cycle at {datetime.now()}")
                 await self._perform_sync_cycle()
-                print(f"[SYNC] Waiting {self.sync_config.background_sync_interval} seconds before next cycle...")
-                await asyncio.sleep(self.sync_config.background_sync_interval)
+                
+                # Schedule relative to the previous tick (fixed rate), not the end of this cycle.
+                # A cycle started early by trigger_now() keeps the pending tick.
+                now = loop.time()
+                if next_run <= now:
+                    next_run += self.sync_config.background_sync_interval
+                if next_run < now:
+                    # Cycle overran one or more ticks - run once, right away
+                    next_run = now
+                delay = next_run - now + random.uniform(0, self.sync_config.background_sync_jitter)
+                
+                print(f"[SYNC] Waiting {delay:.0f} seconds before next cycle...")
+                await self._wait_for_next_cycle(delay)
                 
         except Exception as e:
             print(f"[SYNC ERROR] Background sync service failed: {str(e)}")
@@ -62,8 +93,26 @@ class BackgroundSyncService:
     async def stop_periodic_sync(self) -> None:
         """Stop the periodic sync service."""
         self.is_running = False
+        self._wake_event.set()
         logger.info("Stopping background sync service")
     
+    def trigger_now(self) -> None:
+        """Start the next sync cycle immediately (e.g. on a calendar push notification).
+
+        Safe to call from sync endpoints running in the threadpool; does nothing
+        while the periodic sync isn't running.
+        """
+        if self.is_running and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._wake_event.set)
+    
+    async def _wait_for_next_cycle(self, delay: float) -> None:
+        """Sleep until the next cycle is due or trigger_now()/stop is called."""
+        try:
+            await asyncio.wait_for(self._wake_event.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        self._wake_event.clear()
+    
     async def _perform_sync_cycle(self) -> None:
         """
         Perform one sync cycle.
@@ -86,31 +135,49 @@ class BackgroundSyncService:
             
             # Get database session with proper error handling
             try:
-                db = next(get_db())
+                db = SessionLocal()
                 print("[SYNC CYCLE] Database session acquired")
             except Exception as db_error:
                 logger.error(f"Failed to acquire database session: {str(db_error)}")
                 return
             
+            # Compute the cycle's cutoffs once and share them across users and bookings
+            cycle_now = datetime.now(timezone.utc)
+            window = timedelta(days=self.sync_config.calendar_sync_window_days)
+            calendar_window = (cycle_now - window, cycle_now + window)
+            archive_cutoff = cycle_now - timedelta(days=self.sync_config.sync_lookback_days)
+            
             # Step 1: Calendar → Database sync
             print("[SYNC CYCLE] Step 1 - Calendar to DB...")
-            await self._perform_calendar_to_database_sync(db)
+            await self._perform_calendar_to_database_sync(db, calendar_window)
             
-            # Step 2: Find bookings to sync to calendar
+            # Step 2: Find bookings to sync to calendar, one chunk at a time so
+            # syncing starts before the whole backlog is loaded
             print("[SYNC CYCLE] Step 2 - Find bookings to sync...")
-            bookings_to_sync = self._find_bookings_needing_sync(db)
+            chunk_size = self.sync_config.discovery_chunk_size
+            total_found = 0
+            last_booking_id = None
+            while True:
+                bookings_to_sync = self._find_bookings_needing_sync(
+                    db, archive_cutoff, after_id=last_booking_id, limit=chunk_size
+                )
+                if not bookings_to_sync:
+                    break
+                total_found += len(bookings_to_sync)
+                last_booking_id = bookings_to_sync[-1].id
+                
+                # Push the chunk with batched calendar requests per host
+                await self._sync_bookings_bulk(db, bookings_to_sync)
+                
+                if len(bookings_to_sync) < chunk_size:
+                    break
             
-            if not bookings_to_sync:
+            if not total_found:
                 print("[SYNC CYCLE] No bookings to sync")
                 logger.debug("No bookings need sync to calendar in this cycle")
             else:
-                print(f"[SYNC CYCLE] Found {len(bookings_to_sync)} bookings to sync")
-                logger.info(f"Found {len(bookings_to_sync)} bookings that need sync to calendar")
-                
-                # Process each booking
-                for i, booking in enumerate(bookings_to_sync):
-                    print(f"[SYNC CYCLE] Syncing booking {i+1}/{len(bookings_to_sync)} - ID: {booking.id}")
-                    await self._sync_single_booking(db, booking)
+                print(f"[SYNC CYCLE] Found {total_found} bookings to sync")
+                logger.info("Found %s bookings that need sync to calendar", total_found)
             
             print("[SYNC CYCLE] Completed sync cycle")
             logger.debug("Completed sync cycle")
@@ -127,7 +194,8 @@ class BackgroundSyncService:
                 except Exception as close_error:
                     logger.warning(f"Error closing database session: {str(close_error)}")
     
-    async def _perform_calendar_to_database_sync(self, db: Session) -> None:
+    async def _perform_calendar_to_database_sync(self, db: Session,
+                                                 calendar_window: Optional[Tuple[datetime, datetime]] = None) -> None:
         """
         Calendar to database sync for all connected users.
         What does it do? Finds users with calendars and syncs events to DB.
@@ -146,28 +214,41 @@ class BackgroundSyncService:
                 logger.debug("No users with connected calendars found")
                 return
             
-            logger.info(f"Found {len(users_with_calendar)} users with calendars")
+            logger.info("Found %s users with calendars", len(users_with_calendar))
             
-            # Sync calendar events for each user
-            for user in users_with_calendar:
-                try:
-                    logger.debug(f"Syncing calendar for user {user.id} ({user.email})")
-                    await self.sync_calendar_to_database(db, user.id)
-                except Exception as e:
-                    logger.error(f"Failed to sync calendar for user {user.id}: {str(e)}")
-                    continue
+            # Sync calendar events for all users concurrently. Each user gets its own
+            # session since a session can't be shared across worker threads.
+            semaphore = asyncio.Semaphore(self.sync_config.max_concurrency)
+            
+            async def sync_user_calendar(user: User) -> None:
+                async with semaphore:
+                    user_db = SessionLocal()
+                    try:
+                        logger.debug("Syncing calendar for user %s (%s)", user.id, user.email)
+                        await self.sync_calendar_to_database(user_db, user.id, calendar_window)
+                    except Exception as e:
+                        logger.error(f"Failed to sync calendar for user {user.id}: {str(e)}")
+                    finally:
+                        user_db.close()
+            
+            await asyncio.gather(*(sync_user_calendar(user) for user in users_with_calendar))
             
             logger.debug("Completed calendar to database sync cycle")
             
         except Exception as e:
             logger.error(f"Failed to perform calendar to database sync cycle: {str(e)}")
     
-    def _find_bookings_needing_sync(self, db: Session) -> List[Booking]:
+    def _find_bookings_needing_sync(self, db: Session, archive_cutoff: Optional[datetime] = None,
+                                    after_id: Optional[int] = None, limit: Optional[int] = None) -> List[Booking]:
         """
         Find bookings that need synchronization.
         
         Args:
             db: Database session
+            archive_cutoff: Bookings that ended before this are skipped
+                (defaults to sync_lookback_days ago)
+            after_id: Only return bookings with a higher id (for paging by id)
+            limit: Max number of bookings to return, ordered by id
             
         Returns:
             List of bookings that need sync
@@ -175,17 +256,26 @@ class BackgroundSyncService:
         try:
             # Only find bookings without google_event_id (not synced to Google Calendar)
             # Don't try to update existing calendar events to avoid duplicates
+            # Skip cancelled and long-finished bookings - they will never need a calendar event
+            if archive_cutoff is None:
+                archive_cutoff = datetime.now(timezone.utc) - timedelta(days=self.sync_config.sync_lookback_days)
             
             # Add timeout and retry logic
-            import time
             max_retries = 3
             retry_delay = 2
             
             for attempt in range(max_retries):
                 try:
-                    bookings = db.query(Booking).filter(
-                        Booking.google_event_id.is_(None)
-                    ).all()
+                    query = db.query(Booking).filter(
+                        Booking.google_event_id.is_(None),
+                        Booking.status != "cancelled",
+                        Booking.end_time > archive_cutoff
+                    )
+                    if after_id is not None:
+                        query = query.filter(Booking.id > after_id)
+                    if limit is not None:
+                        query = query.order_by(Booking.id).limit(limit)
+                    bookings = query.all()
                     
                     print(f"[SYNC] Found {len(bookings)} bookings that need sync (without calendar events)")
                     return bookings
@@ -203,67 +293,195 @@ class BackgroundSyncService:
             logger.error(f"Failed to find bookings needing sync: {str(e)}")
             return []
     
-    async def _sync_single_booking(self, db: Session, booking: Booking) -> None:
+    async def _sync_single_booking(self, db: Session, booking: Booking, user: User,
+                                   sync_services: Optional[Dict[int, CalendarSyncService]] = None) -> None:
         """
         Sync a single booking to calendar providers.
         
+        The booking's sync result is written through a short-lived session
+        opened after the provider call, so no connection is held while
+        waiting on the calendar API.
+        
         Args:
-            db: Database session
-            booking: Booking to sync
+            db: Database session the calendar providers use for token refreshes
+            booking: Booking to sync (only its loaded attributes are read)
+            user: Host user of the booking (resolved by the caller)
+            sync_services: Per-user sync services to reuse across bookings
         """
+        booking_id = booking.id
         try:
-            # Get user for this booking
-            user = db.query(User).filter(User.id == booking.host_user_id).first()
-            if not user:
-                logger.warning(f"No user found for booking {booking.id}")
-                return
-            
-            # Initialize sync service for this user
-            sync_service = CalendarSyncService(db, user.id)
-            
-            # Register calendar providers
-            if (user.google_access_token and 
-                user.google_refresh_token and 
-                self.sync_config.is_provider_enabled("google")):
-                
-                google_provider = create_calendar_provider(
-                    CalendarProviderType.GOOGLE,
-                    access_token=user.google_access_token,
-                    refresh_token=user.google_refresh_token,
-                    db=db,
-                    user_id=user.id
-                )
-                sync_service.register_provider(google_provider)
-            
             # Prepare event data for sync
-            event_sync_data = {
-                'summary': f"Meeting with {booking.guest_name}",
-                'description': self._build_event_description(booking),
-                'start': {
-                    'dateTime': booking.start_time.isoformat(),
-                    'timeZone': 'UTC'
-                },
-                'end': {
-                    'dateTime': booking.end_time.isoformat(),
-                    'timeZone': 'UTC'
-                }
-            }
+            event_sync_data = self._build_event_sync_data(booking)
+            
+            # Reuse this user's sync service if an earlier booking already built it.
+            # Providers refresh their own credentials, so a cached one stays valid.
+            sync_service = sync_services.get(user.id) if sync_services is not None else None
+            if sync_service is None:
+                sync_service = self._create_sync_service(db, user)
+                if sync_services is not None:
+                    sync_services[user.id] = sync_service
             
             # Sync to providers - create events for bookings without google_event_id
             # Database is source of truth, calendar is derived
-            sync_results = sync_service.sync_event_to_providers(
+            # Provider calls are blocking HTTP requests - keep them off the event loop
+            sync_results = await asyncio.to_thread(
+                sync_service.sync_event_to_providers,
                 str(booking.id),
                 event_sync_data,
                 "create"  # Always create since we only sync bookings without google_event_id
             )
             
             # Update database with sync results (calendar event ID)
-            self._update_booking_with_sync_results(booking, sync_results)
+            update = self._update_booking_with_sync_results(booking, sync_results)
+            if "google_event_id" in update:
+                print(f"[SYNC] Updated booking {booking_id} with Google event ID: {update['google_event_id']}")
+            with SessionLocal() as write_db:
+                write_db.bulk_update_mappings(Booking, [update])
+                write_db.commit()
             
-            logger.info(f"Successfully synced booking {booking.id} in background")
+            logger.info("Successfully synced booking %s in background", booking_id)
             
         except Exception as e:
-            logger.error(f"Failed to sync booking {booking.id} in background: {str(e)}")
+            logger.error(f"Failed to sync booking {booking_id} in background: {str(e)}")
+    
+    def _create_sync_service(self, db: Session, user: User) -> CalendarSyncService:
+        """Build a sync service with the calendar providers enabled for a user."""
+        sync_service = CalendarSyncService(db, user.id)
+        
+        # Register calendar providers
+        if (user.google_access_token and 
+            user.google_refresh_token and 
+            self.sync_config.is_provider_enabled("google")):
+            
+            google_provider = create_calendar_provider(
+                CalendarProviderType.GOOGLE,
+                access_token=user.google_access_token,
+                refresh_token=user.google_refresh_token,
+                db=db,
+                user_id=user.id
+            )
+            sync_service.register_provider(google_provider)
+        
+        return sync_service
+    
+    async def _sync_bookings_bulk(self, db: Session, bookings: List[Booking]) -> None:
+        """
+        Sync bookings to calendar providers, batching the API calls per host.
+        
+        Args:
+            db: Database session
+            bookings: Bookings to sync
+        """
+        if not self.sync_config.is_provider_enabled("google"):
+            return
+        
+        # Resolve every booking's host in a single query
+        rows = db.query(Booking, User).join(
+            User, User.id == Booking.host_user_id
+        ).filter(
+            Booking.id.in_([booking.id for booking in bookings])
+        ).all()
+        
+        bookings_by_user: Dict[int, Any] = {}
+        for booking, user in rows:
+            bookings_by_user.setdefault(user.id, (user, []))[1].append(booking)
+        
+        user_work = []
+        for user, user_bookings in bookings_by_user.values():
+            if not (user.google_access_token and user.google_refresh_token):
+                continue
+            
+            pending = []
+            for booking in user_bookings:
+                pending.append((booking, self._build_event_sync_data(booking)))
+            
+            if pending:
+                user_work.append((user, pending))
+        
+        # Calendar requests for different hosts run concurrently. The provider
+        # needs its own session because it runs in a worker thread.
+        semaphore = asyncio.Semaphore(self.sync_config.max_concurrency)
+        
+        async def create_user_events(user: User, pending: List[Any]) -> List[Optional[Dict[str, Any]]]:
+            async with semaphore:
+                provider_db = SessionLocal()
+                try:
+                    google_provider = create_calendar_provider(
+                        CalendarProviderType.GOOGLE,
+                        access_token=user.google_access_token,
+                        refresh_token=user.google_refresh_token,
+                        db=provider_db,
+                        user_id=user.id
+                    )
+                    
+                    # Batched inserts are blocking HTTP requests - keep them off the event loop
+                    return await asyncio.to_thread(
+                        google_provider.create_events_batch,
+                        [event_sync_data for _, event_sync_data in pending],
+                        self.sync_config.batch_size
+                    )
+                finally:
+                    provider_db.close()
+        
+        results = await asyncio.gather(
+            *(create_user_events(user, pending) for user, pending in user_work),
+            return_exceptions=True
+        )
+        
+        # Collect the results: created events need a per-row event id, failed
+        # ones only get their timestamp touched, which one UPDATE ... IN covers
+        updates = []
+        failed_ids = []
+        for (user, pending), created_events in zip(user_work, results):
+            if isinstance(created_events, Exception):
+                logger.error(f"Failed to sync bookings for user {user.id} in background: {str(created_events)}")
+                continue
+            
+            for (booking, _), created_event in zip(pending, created_events):
+                if created_event is None:
+                    failed_ids.append(booking.id)
+                    continue
+                sync_results = {
+                    'google': {
+                        'success': True,
+                        'result': created_event
+                    }
+                }
+                updates.append(self._update_booking_with_sync_results(booking, sync_results))
+            logger.info("Synced %s bookings for user %s in background", len(pending), user.id)
+        
+        if not updates and not failed_ids:
+            return
+        
+        for update in updates:
+            logger.debug("Updated booking %s with Google event ID: %s", update['id'], update['google_event_id'])
+        
+        try:
+            if updates:
+                db.bulk_update_mappings(Booking, updates)
+            if failed_ids:
+                db.query(Booking).filter(Booking.id.in_(failed_ids)).update(
+                    {Booking.updated_at: func.now()}, synchronize_session=False
+                )
+            db.commit()
+        except Exception as e:
+            logger.error(f"Failed to save background sync results: {str(e)}")
+            db.rollback()
+    
+    def _build_event_sync_data(self, booking: Booking) -> Dict[str, Any]:
+        """Build the calendar event payload for a booking."""
+        return {
+            'summary': f"Meeting with {booking.guest_name}",
+            'description': self._build_event_description(booking),
+            'start': {
+                'dateTime': booking.start_time.isoformat(),
+                'timeZone': 'UTC'
+            },
+            'end': {
+                'dateTime': booking.end_time.isoformat(),
+                'timeZone': 'UTC'
+            }
+        }
     
     def _build_event_description(self, booking: Booking) -> str:
         """Build event description from booking."""
@@ -272,8 +490,15 @@ class BackgroundSyncService:
             description += f"\nMessage: {booking.guest_message}"
         return description
     
-    def _update_booking_with_sync_results(self, booking: Booking, sync_results: Dict[str, Any]) -> None:
-        """Update booking with sync results from providers."""
+    def _update_booking_with_sync_results(self, booking: Booking, sync_results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Build the booking update for sync results from providers.
+        
+        Returns:
+            Mapping for Session.bulk_update_mappings(Booking, ...)
+        """
+        # Always update the booking timestamp
+        update = {"id": booking.id, "updated_at": datetime.utcnow()}
         try:
             for provider_name, result in sync_results.items():
                 # Handle None results from providers (e.g., when event_id is None)
@@ -282,19 +507,14 @@ class BackgroundSyncService:
                     
                 if result.get('success') and result.get('result', {}).get('id'):
                     if provider_name == 'google':
-                        booking.google_event_id = result['result']['id']
-                        print(f"[SYNC] Updated booking {booking.id} with Google event ID: {result['result']['id']}")
+                        update["google_event_id"] = result['result']['id']
                     # Future: Handle other providers
                     break
             
-            # Update the booking timestamp
-            booking.updated_at = datetime.utcnow()
-            print(f"[SYNC] Updated booking {booking.id} timestamp")
-            
         except Exception as e:
             logger.error(f"Failed to update booking {booking.id} with sync results: {str(e)}")
-            # Still update the basic fields even if sync status update fails
-            booking.updated_at = datetime.utcnow()
+        
+        return update
     
     async def sync_failed_bookings(self) -> Dict[str, Any]:
         """
@@ -304,31 +524,63 @@ class BackgroundSyncService:
             Sync results summary
         """
         try:
-            db = next(get_db())
-            
-            # Find bookings without google_event_id (not synced to Google Calendar)
-            failed_bookings = db.query(Booking).filter(
-                Booking.google_event_id.is_(None)
-            ).all()
-            
-            if not failed_bookings:
-                return {"success": True, "message": "No failed bookings found", "synced_count": 0}
+            # Load everything up front and release the session before any calendar calls
+            with SessionLocal() as db:
+                # Find bookings without google_event_id (not synced to Google Calendar),
+                # oldest first and capped so one call can't run unbounded
+                failed_bookings = db.query(Booking).filter(
+                    Booking.google_event_id.is_(None)
+                ).order_by(Booking.id).limit(self.sync_config.discovery_chunk_size).all()
+            
+                if not failed_bookings:
+                    return {"success": True, "message": "No failed bookings found", "synced_count": 0}
+            
+                # Resolve all host users in one query instead of one per booking
+                host_user_ids = {booking.host_user_id for booking in failed_bookings}
+                users_by_id = {
+                    user.id: user
+                    for user in db.query(User).filter(User.id.in_(host_user_ids))
+                }
             
-            synced_count = 0
+            bookings_by_user: Dict[int, List[Booking]] = {}
             for booking in failed_bookings:
-                try:
-                    await self._sync_single_booking(db, booking)
-                    synced_count += 1
-                except Exception as e:
-                    logger.error(f"Failed to sync booking {booking.id}: {str(e)}")
-            
+                if booking.host_user_id not in users_by_id:
+                    logger.warning(f"No user found for booking {booking.id}")
+                    continue
+                bookings_by_user.setdefault(booking.host_user_id, []).append(booking)
+        
+            # Hosts sync concurrently; each host's providers get their own session
+            # (for token refreshes) since provider calls run in worker threads
+            semaphore = asyncio.Semaphore(self.sync_config.max_concurrency)
+        
+            async def sync_user_bookings(user: User, user_bookings: List[Booking]) -> int:
+                async with semaphore:
+                    with SessionLocal() as user_db:
+                        sync_services: Dict[int, CalendarSyncService] = {}
+                        for booking in user_bookings:
+                            await self._sync_single_booking(user_db, booking, user, sync_services)
+                        return len(user_bookings)
+        
+            user_ids = list(bookings_by_user)
+            results = await asyncio.gather(
+                *(sync_user_bookings(users_by_id[user_id], bookings_by_user[user_id]) for user_id in user_ids),
+                return_exceptions=True
+            )
+        
+            synced_count = 0
+            for user_id, result in zip(user_ids, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Failed to sync bookings for user {user_id}: {str(result)}")
+                else:
+                    synced_count += result
+        
             return {
                 "success": True,
                 "message": f"Synced {synced_count} out of {len(failed_bookings)} failed bookings",
                 "synced_count": synced_count,
                 "total_failed": len(failed_bookings)
             }
-            
+        
         except Exception as e:
             logger.error(f"Failed to sync failed bookings: {str(e)}")
             return {"success": False, "error": str(e)}
@@ -341,50 +593,54 @@ class BackgroundSyncService:
             Dict containing sync status summary
         """
         try:
-            db = next(get_db())
-            
-            # Get all users with calendar connections
-            users_with_calendar = db.query(User).filter(
-                User.google_access_token.isnot(None),
-                User.google_refresh_token.isnot(None)
-            ).all()
-            
-            summary = {
-                "total_users_with_calendar": len(users_with_calendar),
-                "users_sync_status": []
-            }
-            
-            for user in users_with_calendar:
-                user_bookings = db.query(Booking).filter(
-                    Booking.host_user_id == user.id
-                ).all()
-                
-                # Count bookings by sync status using google_event_id
-                synced_count = len([b for b in user_bookings if b.google_event_id is not None])
-                unsynced_count = len([b for b in user_bookings if b.google_event_id is None])
-                
-                summary["users_sync_status"].append({
-                    "user_id": user.id,
-                    "email": user.email,
-                    "total_bookings": len(user_bookings),
-                    "synced_bookings": synced_count,
-                    "unsynced_bookings": unsynced_count
-                })
+            with SessionLocal() as db:
+                # Users with calendar connections and their booking counts in one
+                # aggregate query (COUNT(column) skips NULLs, so users without
+                # bookings get 0/0 from the outer join)
+                rows = db.query(
+                    User.id,
+                    User.email,
+                    func.count(Booking.id),
+                    func.count(Booking.google_event_id)
+                ).outerjoin(
+                    Booking, Booking.host_user_id == User.id
+                ).filter(
+                    User.google_access_token.isnot(None),
+                    User.google_refresh_token.isnot(None)
+                ).group_by(User.id, User.email).all()
+
+                summary = {
+                    "total_users_with_calendar": len(rows),
+                    "users_sync_status": []
+                }
+
+                for user_id, email, total_count, synced_count in rows:
+                    summary["users_sync_status"].append({
+                        "user_id": user_id,
+                        "email": email,
+                        "total_bookings": total_count,
+                        "synced_bookings": synced_count,
+                        "unsynced_bookings": total_count - synced_count
+                    })
             
-            return summary
+                return summary
             
         except Exception as e:
             logger.error(f"Failed to get sync status summary: {str(e)}")
             return {"error": str(e)}
 
-    async def sync_calendar_to_database(self, db: Session, user_id: int) -> Dict[str, Any]:
+    async def sync_calendar_to_database(self, db: Session, user_id: int,
+                                        calendar_window: Optional[Tuple[datetime, datetime]] = None) -> Dict[str, Any]:
         """
         Pull calendar events and sync to database.
         What does it do? Calendar → Database sync.
+        
+        calendar_window is the (start, end) range used for a full sync; it
+        defaults to calendar_sync_window_days around now.
         """
         try:
             print(f"[SYNC SERVICE] Starting calendar sync for user {user_id}")
-            logger.info(f"Starting calendar to database sync for user {user_id}")
+            logger.info("Starting calendar to database sync for user %s", user_id)
             
             # Get user
             print(f"[SYNC SERVICE] Getting user...")
@@ -402,7 +658,6 @@ class BackgroundSyncService:
             
             # Initialize Google Calendar service
             print(f"[SYNC SERVICE] Initializing Google Calendar...")
-            from app.services.google_calendar_service import GoogleCalendarService
             calendar_service = GoogleCalendarService(
                 access_token=user.google_access_token,
                 refresh_token=user.google_refresh_token,
@@ -411,13 +666,22 @@ class BackgroundSyncService:
             )
             
             # Get events from Google Calendar
-            from datetime import datetime, timedelta, timezone
-            start_date = datetime.now(timezone.utc) - timedelta(days=7)
-            end_date = datetime.now(timezone.utc) + timedelta(days=7)
+            if calendar_window is None:
+                now = datetime.now(timezone.utc)
+                window = timedelta(days=self.sync_config.calendar_sync_window_days)
+                calendar_window = (now - window, now + window)
+            start_date, end_date = calendar_window
             
             print(f"[SYNC SERVICE] Fetching events...")
             try:
-                calendar_events = calendar_service.get_events(start_date, end_date)
+                # Only fetch events changed since the last cycle when we have a sync token
+                # The Google API client is synchronous; run it in a worker thread
+                # so it doesn't block the event loop
+                event_changes = await asyncio.to_thread(
+                    calendar_service.get_events_incremental,
+                    user.google_calendar_sync_token, start_date, end_date
+                )
+                calendar_events = event_changes['events']
                 print(f"[SYNC SERVICE] Found {len(calendar_events)} events")
             except Exception as e:
                 print(f"[SYNC SERVICE] Failed to fetch events: {str(e)}")
@@ -431,11 +695,29 @@ class BackgroundSyncService:
             
             events_created = 0
             events_updated = 0
-            
+
+            events_failed = 0
+
+            next_sync_token = event_changes.get('next_sync_token')
+            token_changed = bool(next_sync_token) and next_sync_token != user.google_calendar_sync_token
+
+            if not calendar_events:
+                # Nothing changed since the last sync - only persist the new token
+                if token_changed:
+                    user.google_calendar_sync_token = next_sync_token
+                    db.commit()
+                print(f"[SYNC SERVICE] No calendar changes since last sync")
+                return {
+                    "success": True,
+                    "events_created": 0,
+                    "events_updated": 0,
+                    "total_events_processed": 0
+                }
+
             print(f"[SYNC SERVICE] Processing {len(calendar_events)} events...")
             for i, event in enumerate(calendar_events):
                 try:
-                    print(f"[SYNC SERVICE] Processing event {i+1}/{len(calendar_events)} - {event.get('summary', 'No title')}")
+                    logger.debug("Processing event %d/%d - %s", i + 1, len(calendar_events), event.get('summary', 'No title'))
                     
                     # Check if booking exists for this event
                     existing_booking = db.query(Booking).filter(
@@ -444,28 +726,34 @@ class BackgroundSyncService:
                     ).first()
                     
                     if existing_booking:
-                        print(f"[SYNC SERVICE] Found booking {existing_booking.id} for event {event.get('id')}")
+                        logger.debug("Found booking %s for event %s", existing_booking.id, event.get('id'))
                         # Update if event changed
                         if self._has_event_changed(existing_booking, event):
                             self._update_booking_from_calendar_event(existing_booking, event)
                             events_updated += 1
-                            print(f"[SYNC SERVICE] Updated booking {existing_booking.id}")
-                            logger.info(f"Updated booking {existing_booking.id} from calendar event")
+                            logger.info("Updated booking %s from calendar event", existing_booking.id)
                         else:
-                            print(f"[SYNC SERVICE] Event unchanged")
+                            logger.debug("Event %s unchanged", event.get('id'))
                     else:
-                        print(f"[SYNC SERVICE] Skipping event {event.get('id')} - Database-First")
+                        logger.debug("Skipping event %s - Database-First", event.get('id'))
                 
                 except Exception as e:
-                    print(f"[SYNC SERVICE ERROR] Failed to process event {event.get('id')}: {str(e)}")
                     logger.error(f"Failed to process calendar event {event.get('id')}: {str(e)}")
+                    events_failed += 1
                     continue
             
+            # Advance the sync token only once every change has been applied; with
+            # the old token the next cycle fetches the failed events again
+            if events_failed:
+                logger.warning("Keeping previous sync token for user %s: %s events failed", user_id, events_failed)
+            elif token_changed:
+                user.google_calendar_sync_token = next_sync_token
+            
             print(f"[SYNC SERVICE] Committing changes...")
             db.commit()
             
             print(f"[SYNC SERVICE] Sync completed: {events_updated} updated")
-            logger.info(f"Calendar to database sync completed: {events_updated} updated (Database-First approach)")
+            logger.info("Calendar to database sync completed: %s updated (Database-First approach)", events_updated)
             
             return {
                 "success": True,
@@ -499,8 +787,6 @@ class BackgroundSyncService:
             if not event_start or not event_end:
                 return False
             
-            from datetime import datetime
-            
             # Determine event type and parse accordingly
             is_all_day = 'date' in start_data
             
@@ -510,8 +796,8 @@ class BackgroundSyncService:
                 event_end_dt = datetime.fromisoformat(event_end + 'T23:59:59+00:00')
             else:
                 # Time-specific event
-                event_start_dt = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
-                event_end_dt = datetime.fromisoformat(event_end.replace('Z', '+00:00'))
+                event_start_dt = datetime.fromisoformat(event_start)
+                event_end_dt = datetime.fromisoformat(event_end)
             
             # Compare times (with small tolerance for timezone differences)
             time_diff = abs((event_start_dt - booking.start_time).total_seconds())
@@ -547,8 +833,6 @@ class BackgroundSyncService:
             event_summary = event.get('summary', '')
             event_description = event.get('description', '')
             
-            from datetime import datetime
-            
             if event_start:
                 # Determine if it's all-day or time-specific
                 is_all_day = 'date' in start_data
@@ -558,7 +842,7 @@ class BackgroundSyncService:
                     booking.start_time = datetime.fromisoformat(event_start + 'T00:00:00+00:00')
                 else:
                     # Time-specific event
-                    booking.start_time = datetime.fromisoformat(event_start.replace('Z', '+00:00'))
+                    booking.start_time = datetime.fromisoformat(event_start)
             
             if event_end:
                 # Determine if it's all-day or time-specific
@@ -569,7 +853,7 @@ class BackgroundSyncService:
                     booking.end_time = datetime.fromisoformat(event_end + 'T23:59:59+00:00')
                 else:
                     # Time-specific event
-                    booking.end_time = datetime.fromisoformat(event_end.replace('Z', '+00:00'))
+                    booking.end_time = datetime.fromisoformat(event_end)
             
             if event_summary:
                 booking.guest_name = event_summary
@@ -577,8 +861,9 @@ class BackgroundSyncService:
             if event_description:
                 booking.guest_message = event_description
             
-            booking.sync_status = "synced"
-            booking.last_synced = datetime.utcnow()
+            if self._sync_columns_exist:
+                booking.sync_status = "synced"
+                booking.last_synced = datetime.utcnow()
             
         except Exception as e:
             logger.error(f"Error updating booking from calendar event: {str(e)}")
@@ -1,12 +1,17 @@
 """
 Webhook Handler - Processes external calendar updates.
 This module handles webhooks from calendar providers to keep our database in sync.
+Database work is blocking and runs through asyncio.to_thread so webhook bursts
+don't stall the event loop.
 """
 
 from typing import Dict, Any, Optional
 from datetime import datetime
+import asyncio
 import logging
+import hashlib
 import json
+import sys
 
 from fastapi import HTTPException, status
 from sqlalchemy.orm import Session
@@ -14,10 +19,21 @@ from sqlalchemy.orm import Session
 from app.models.models import Booking, AvailabilitySlot, User
 from app.core.calendar_architecture import CalendarProviderType
 from app.core.sync_config import get_sync_config
+from app.services.sync.background_sync import background_sync_service
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# fromisoformat accepts a trailing 'Z' from Python 3.11 on
+_FROMISOFORMAT_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def _parse_event_datetime(value: str) -> datetime:
+    """Parse an RFC 3339 timestamp from a calendar event."""
+    if not _FROMISOFORMAT_ACCEPTS_Z and value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
 
 class WebhookHandler:
     """
@@ -35,7 +51,7 @@ class WebhookHandler:
         self.db = db
         self.sync_config = get_sync_config()
     
-    def process_google_calendar_webhook(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_google_calendar_webhook(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process Google Calendar webhook.
         
@@ -47,6 +63,8 @@ class WebhookHandler:
         """
         try:
             logger.info("Processing Google Calendar webhook")
+            # The calendar changed; pull it in the next cycle instead of waiting for the interval
+            background_sync_service.trigger_now()
             
             # Extract event information from webhook
             event_data = self._extract_google_event_data(webhook_data)
@@ -55,22 +73,22 @@ class WebhookHandler:
                 return {"success": False, "error": "No valid event data"}
             
             # Find corresponding booking in database
-            booking = self._find_booking_by_google_event_id(event_data.get('id'))
+            booking = await asyncio.to_thread(self._find_booking_by_google_event_id, event_data.get('id'))
             if not booking:
                 logger.warning(f"No booking found for Google event ID: {event_data.get('id')}")
                 return {"success": False, "error": "No corresponding booking found"}
             
             # Update booking based on webhook data
-            update_result = self._update_booking_from_external_event(booking, event_data)
+            update_result = await self._update_booking_from_external_event(booking, event_data)
             
-            logger.info(f"Successfully processed Google Calendar webhook for booking {booking.id}")
+            logger.info("Successfully processed Google Calendar webhook for booking %s", booking.id)
             return {"success": True, "booking_id": booking.id, "update_result": update_result}
             
         except Exception as e:
             logger.error(f"Failed to process Google Calendar webhook: {str(e)}")
             return {"success": False, "error": str(e)}
     
-    def process_microsoft_calendar_webhook(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def process_microsoft_calendar_webhook(self, webhook_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Process Microsoft Calendar webhook (future implementation).
         
@@ -150,7 +168,7 @@ class WebhookHandler:
             logger.error(f"Failed to find booking by Google event ID {google_event_id}: {str(e)}")
             return None
     
-    def _update_booking_from_external_event(self, booking: Booking, event_data: Dict[str, Any]) -> Dict[str, Any]:
+    async def _update_booking_from_external_event(self, booking: Booking, event_data: Dict[str, Any]) -> Dict[str, Any]:
         """
         Update booking from external calendar event.
         
@@ -162,50 +180,59 @@ class WebhookHandler:
             Update result
         """
         try:
-            updates = {}
-            
-            # Update title/summary if changed
-            if event_data.get('summary') and event_data['summary'] != booking.guest_name:
-                booking.guest_name = event_data['summary']
-                updates['guest_name'] = event_data['summary']
+            # Google redelivers notifications; skip payloads we've already applied
+            payload_hash = hashlib.blake2b(
+                json.dumps(event_data, sort_keys=True, default=str).encode(), digest_size=16
+            ).hexdigest()
+            if booking.last_webhook_hash == payload_hash:
+                logger.info("Duplicate webhook payload for booking %s, skipping", booking.id)
+                return {"updated": False, "changes": {}, "skipped": "duplicate"}
             
-            # Update description if changed
-            if event_data.get('description') and event_data['description'] != booking.guest_message:
-                booking.guest_message = event_data['description']
-                updates['guest_message'] = event_data['description']
-            
-            # Update times if changed
+            # Build the proposed values once, then keep only those that differ
+            proposed = {}
+            if event_data.get('summary'):
+                proposed['guest_name'] = event_data['summary']
+            if event_data.get('description'):
+                proposed['guest_message'] = event_data['description']
             if event_data.get('start'):
-                new_start_time = datetime.fromisoformat(event_data['start'].replace('Z', '+00:00'))
-                if new_start_time != booking.start_time:
-                    booking.start_time = new_start_time
-                    updates['start_time'] = new_start_time
-            
+                proposed['start_time'] = _parse_event_datetime(event_data['start'])
             if event_data.get('end'):
-                new_end_time = datetime.fromisoformat(event_data['end'].replace('Z', '+00:00'))
-                if new_end_time != booking.end_time:
-                    booking.end_time = new_end_time
-                    updates['end_time'] = new_end_time
-            
-            # Update status if event was cancelled
+                proposed['end_time'] = _parse_event_datetime(event_data['end'])
             if event_data.get('status') == 'cancelled':
-                booking.status = 'cancelled'
-                updates['status'] = 'cancelled'
+                proposed['status'] = 'cancelled'
             
-            # Commit changes if any updates were made
+            updates = {
+                field: value for field, value in proposed.items()
+                if getattr(booking, field) != value
+            }
+            
+            # Write all changes with a single UPDATE
             if updates:
-                self.db.commit()
-                logger.info(f"Updated booking {booking.id} from external calendar: {list(updates.keys())}")
+                await asyncio.to_thread(
+                    self._apply_booking_updates, booking.id, {**updates, 'last_webhook_hash': payload_hash}
+                )
+                logger.info("Updated booking %s from external calendar: %s", booking.id, list(updates.keys()))
                 return {"updated": True, "changes": updates}
             else:
-                logger.info(f"No changes needed for booking {booking.id}")
+                logger.info("No changes needed for booking %s", booking.id)
                 return {"updated": False, "changes": {}}
             
         except Exception as e:
             logger.error(f"Failed to update booking {booking.id} from external event: {str(e)}")
-            self.db.rollback()
+            await asyncio.to_thread(self.db.rollback)
             return {"updated": False, "error": str(e)}
     
+    def _apply_booking_updates(self, booking_id: int, values: Dict[str, Any]) -> None:
+        """
+        Write changed booking fields in one UPDATE and commit.
+        
+        Args:
+            booking_id: Booking to update
+            values: Column values to set
+        """
+        self.db.query(Booking).filter(Booking.id == booking_id).update(values, synchronize_session=False)
+        self.db.commit()  # Expires the loaded booking, so it reloads the new values
+    
     def validate_webhook_signature(self, webhook_data: Dict[str, Any], signature: str, provider: str) -> bool:
         """
         Validate webhook signature for security.
@@ -228,7 +255,7 @@ class WebhookHandler:
             logger.error(f"Failed to validate webhook signature: {str(e)}")
             return False
     
-    def handle_webhook(self, provider: str, webhook_data: Dict[str, Any], signature: str = None) -> Dict[str, Any]:
+    async def handle_webhook(self, provider: str, webhook_data: Dict[str, Any], signature: str = None) -> Dict[str, Any]:
         """
         Main webhook handler that routes to appropriate provider handler.
         
@@ -250,9 +277,9 @@ class WebhookHandler:
             
             # Route to appropriate provider handler
             if provider == "google":
-                return self.process_google_calendar_webhook(webhook_data)
+                return await self.process_google_calendar_webhook(webhook_data)
             elif provider == "microsoft":
-                return self.process_microsoft_calendar_webhook(webhook_data)
+                return await self.process_microsoft_calendar_webhook(webhook_data)
             else:
                 logger.warning(f"Unsupported calendar provider: {provider}")
                 return {"success": False, "error": f"Unsupported provider: {provider}"}
@@ -1,11 +1,41 @@
 import os
+import threading
+import time
 import requests
 from datetime import datetime, timezone
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.models import User
+from app.services.user_service import get_user_by_email
+
+# Shared HTTP session so token checks and refreshes reuse pooled keep-alive connections
+_http_session = requests.Session()
+_http_session.mount("https://", requests.adapters.HTTPAdapter(pool_connections=10, pool_maxsize=50))
+GOOGLE_REQUEST_TIMEOUT = 10  # seconds
+
+# Access tokens last ~3600s; trust a validated token for a bit less than that
+# instead of hitting the userinfo endpoint on every call
+TOKEN_VALIDITY_TTL = 3000  # seconds
+_token_valid_until: Dict[int, Tuple[str, float]] = {}  # user_id -> (access_token, monotonic deadline)
+_token_cache_lock = threading.Lock()
+
+
+def _mark_token_valid(user_id: int, access_token: str) -> None:
+    with _token_cache_lock:
+        _token_valid_until[user_id] = (access_token, time.monotonic() + TOKEN_VALIDITY_TTL)
+
+
+def _invalidate_token(user_id: int) -> None:
+    with _token_cache_lock:
+        _token_valid_until.pop(user_id, None)
+
+
+def _is_token_known_valid(user_id: int, access_token: str) -> bool:
+    with _token_cache_lock:
+        cached = _token_valid_until.get(user_id)
+    return cached is not None and cached[0] == access_token and time.monotonic() < cached[1]
 
 
 class TokenRefreshService:
@@ -35,7 +65,7 @@ class TokenRefreshService:
             headers = {"Content-Type": "application/x-www-form-urlencoded"}
             
             # Make the refresh request
-            response = requests.post(token_url, data=token_data, headers=headers)
+            response = _http_session.post(token_url, data=token_data, headers=headers, timeout=GOOGLE_REQUEST_TIMEOUT)
             response.raise_for_status()
             
             tokens = response.json()
@@ -55,6 +85,7 @@ class TokenRefreshService:
                 user.google_refresh_token = new_refresh_token
             
             self.db.commit()
+            _mark_token_valid(user.id, new_access_token)
             
             return {
                 "success": True,
@@ -95,14 +126,24 @@ class TokenRefreshService:
                     "requires_reconnection": True
                 }
             
+            # Skip the round-trip if this token was validated recently
+            if _is_token_known_valid(user.id, user.google_access_token):
+                return {
+                    "success": True,
+                    "message": "Tokens are valid",
+                    "access_token": user.google_access_token,
+                    "refresh_token": user.google_refresh_token
+                }
+            
             # Test the current access token by making a simple API call
             test_url = "https://www.googleapis.com/oauth2/v2/userinfo"
             headers = {"Authorization": f"Bearer {user.google_access_token}"}
             
-            response = requests.get(test_url, headers=headers)
+            response = _http_session.get(test_url, headers=headers, timeout=GOOGLE_REQUEST_TIMEOUT)
             
             if response.status_code == 200:
                 # Token is still valid
+                _mark_token_valid(user.id, user.google_access_token)
                 return {
                     "success": True,
                     "message": "Tokens are valid",
@@ -111,6 +152,7 @@ class TokenRefreshService:
                 }
             elif response.status_code == 401:
                 # Token is expired, try to refresh
+                _invalidate_token(user.id)
                 if user.google_refresh_token:
                     return self.refresh_user_tokens(user)
                 else:
@@ -133,13 +175,9 @@ class TokenRefreshService:
                 "requires_reconnection": False
             }
     
-    def get_user_by_scheduling_slug(self, scheduling_slug: str) -> Optional[User]:
-        """Get user by scheduling slug."""
-        return self.db.query(User).filter(User.scheduling_slug == scheduling_slug).first()
-    
     def get_user_by_email(self, email: str) -> Optional[User]:
         """Get user by email."""
-        return self.db.query(User).filter(User.email == email).first()
+        return get_user_by_email(self.db, email)
 
 
 def get_token_refresh_service(db: Session) -> TokenRefreshService:
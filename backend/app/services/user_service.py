@@ -1,62 +1,154 @@
+import asyncio
+import functools
+import hashlib
+import hmac
+import re
+import threading
+import time
 import uuid
 import secrets
 import string
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, load_only
 
+from app.core.config import settings
 from app.core.hashing import get_password_hash, verify_password
 from app.models.models import User
 from app.schemas.schemas import UserCreate
 
 
 async def get_user(db: Session, user_id: str):
-    return db.query(User).filter(User.id == user_id).first()
+    # Session queries block; run them in a worker thread so the event loop stays free
+    return await asyncio.to_thread(
+        lambda: db.query(User).filter(User.id == user_id).first()
+    )
 
 
 def get_user_by_email(db: Session, email: str):
     return db.query(User).filter(User.email == email).first()
 
 
-async def get_user_by_scheduling_slug(db: Session, scheduling_slug: str):
-    return (
+def email_exists(db: Session, email: str) -> bool:
+    """Check whether an account uses this email without loading the user."""
+    return db.query(db.query(User.id).filter(User.email == email).exists()).scalar()
+
+
+# Short-lived cache of login records, so repeated logins skip the users lookup by
+# email. Only the id and the fields login checks are kept - never ORM instances,
+# which would be detached from the caller's session - so authenticate_user hands
+# back the user loaded by primary key in the caller's session.
+USER_CACHE_TTL = 60  # seconds
+USER_CACHE_MAX_SIZE = 10_000
+_login_record_cache: Dict[str, Tuple["_LoginRecord", float]] = {}  # email -> (login record, monotonic deadline)
+_user_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class _LoginRecord:
+    id: int
+    hashed_password: Optional[str]
+    is_verified: bool
+
+
+def _get_cached_login_record(db: Session, email: str) -> Optional[_LoginRecord]:
+    with _user_cache_lock:
+        cached = _login_record_cache.get(email)
+    if cached is not None and time.monotonic() < cached[1]:
+        return cached[0]
+    
+    row = db.query(User.id, User.hashed_password, User.is_verified).filter(User.email == email).first()
+    if row is None:
+        return None
+    record = _LoginRecord(id=row.id, hashed_password=row.hashed_password, is_verified=bool(row.is_verified))
+    with _user_cache_lock:
+        if len(_login_record_cache) >= USER_CACHE_MAX_SIZE:
+            _login_record_cache.pop(next(iter(_login_record_cache)))  # Drop the oldest entry
+        _login_record_cache[email] = (record, time.monotonic() + USER_CACHE_TTL)
+    return record
+
+
+def invalidate_cached_user(email: str) -> None:
+    """Drop a user from the login cache after their record changes."""
+    with _user_cache_lock:
+        _login_record_cache.pop(email, None)
+
+
+# Same idea for the public booking page, which resolves the same slug on every
+# pageview (crawlers and link previews included). Entries are detached read-only
+# copies of the public profile columns only - no password hash or Google tokens;
+# paths that need the full host record reload the row by id.
+SLUG_CACHE_TTL = 120  # seconds
+SLUG_CACHE_MAX_SIZE = 10_000
+_user_by_slug_cache: Dict[str, Tuple[User, float]] = {}  # slug -> (detached user, monotonic deadline)
+_slug_cache_lock = threading.Lock()
+PUBLIC_USER_COLUMNS = (User.id, User.full_name, User.email, User.scheduling_slug, User.timezone, User.is_active)
+
+
+def _load_active_user_by_slug(db: Session, scheduling_slug: str) -> Optional[User]:
+    user = (
         db.query(User)
+        .options(load_only(*PUBLIC_USER_COLUMNS))
         .filter(User.scheduling_slug == scheduling_slug)
         .filter(User.is_active == True)
         .first()
     )
+    if user is not None:
+        db.expunge(user)  # Detach so the cached copy isn't tied to this request's session
+    return user
 
 
-def generate_unique_scheduling_slug(db: Session, base_name: str = None) -> str:
-    """Generate a unique scheduling slug for a user."""
-    if base_name:
-        # Clean the base name for URL safety
-        clean_name = "".join(c for c in base_name.lower() if c.isalnum() or c == "-")
-        clean_name = clean_name[:20]  # Limit length
-    else:
-        clean_name = "user"
-    
-    # Try the clean name first
-    if not db.query(User).filter(User.scheduling_slug == clean_name).first():
-        return clean_name
-    
-    # If taken, add random suffix
-    for attempt in range(10):  # Try up to 10 times
-        suffix = ''.join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(6))
-        slug = f"{clean_name}-{suffix}"
-        if not db.query(User).filter(User.scheduling_slug == slug).first():
-            return slug
+async def get_user_by_scheduling_slug(db: Session, scheduling_slug: str):
+    with _slug_cache_lock:
+        cached = _user_by_slug_cache.get(scheduling_slug)
+    if cached is not None and time.monotonic() < cached[1]:
+        return cached[0]
     
-    # If all else fails, use a completely random slug
-    return ''.join(secrets.choice(string.ascii_lowercase + string.digits) for _ in range(12))
+    user = await asyncio.to_thread(_load_active_user_by_slug, db, scheduling_slug)
+    if user is None:
+        return None
+    with _slug_cache_lock:
+        if len(_user_by_slug_cache) >= SLUG_CACHE_MAX_SIZE:
+            _user_by_slug_cache.pop(next(iter(_user_by_slug_cache)))  # Drop the oldest entry
+        _user_by_slug_cache[scheduling_slug] = (user, time.monotonic() + SLUG_CACHE_TTL)
+    return user
+
+
+def invalidate_cached_slug(scheduling_slug: str) -> None:
+    """Drop a slug from the booking page cache after it is (re)assigned."""
+    with _slug_cache_lock:
+        _user_by_slug_cache.pop(scheduling_slug, None)
+
 
+SLUG_ALPHABET = string.ascii_lowercase + string.digits
+SLUG_SUFFIX_LENGTH = 8  # 36**8 ~ 2.8e12 suffixes, so collisions are vanishingly rare
+SLUG_INSERT_ATTEMPTS = 2
 
-def create_user(db: Session, user: UserCreate):
-    hashed_password = get_password_hash(user.password) if user.password else None
+
+# Anything but letters, digits and '-' (\w also matches '_', so drop that explicitly)
+_SLUG_STRIP = re.compile(r"[^\w-]|_")
+
+
+def _clean_slug_base(base_name: str = None) -> str:
+    """Turn a name into a URL-safe slug base."""
+    if base_name:
+        # Clean the base name for URL safety, limited in length
+        return _SLUG_STRIP.sub("", base_name.lower())[:20] or "user"
+    return "user"
+
+
+def _random_slug(length: int) -> str:
+    return ''.join(secrets.choice(SLUG_ALPHABET) for _ in range(length))
+
+
+async def create_user(db: Session, user: UserCreate):
+    # bcrypt is CPU-bound; hash in a worker thread so the event loop stays free
+    hashed_password = await asyncio.to_thread(get_password_hash, user.password) if user.password else None
     verification_token = str(uuid.uuid4()) if not user.google_id else None
     
-    # Generate unique scheduling slug
-    scheduling_slug = generate_unique_scheduling_slug(db, user.full_name)
-    
+    clean_name = _clean_slug_base(user.full_name)
     db_user = User(
         email=user.email,
         full_name=user.full_name,
@@ -64,24 +156,87 @@ def create_user(db: Session, user: UserCreate):
         google_id=user.google_id,
         is_verified=bool(user.google_id),  # Google users are auto-verified
         verification_token=verification_token,
-        scheduling_slug=scheduling_slug
+        scheduling_slug=f"{clean_name}-{_random_slug(SLUG_SUFFIX_LENGTH)}"
     )
-    db.add(db_user)
+    
+    # The random suffix is unique in practice, so insert without probing first and
+    # let the unique index on scheduling_slug reject the rare collision
+    for attempt in range(SLUG_INSERT_ATTEMPTS):
+        try:
+            with db.begin_nested():
+                db.add(db_user)
+            break
+        except IntegrityError:
+            slug_taken = db.query(User.id).filter(User.scheduling_slug == db_user.scheduling_slug).first()
+            if not slug_taken or attempt == SLUG_INSERT_ATTEMPTS - 1:
+                raise  # Some other constraint (e.g. duplicate email), or out of attempts
+            db_user.scheduling_slug = f"{clean_name}-{_random_slug(SLUG_SUFFIX_LENGTH)}"
     db.commit()
+    # created_at comes from the database, so reload the row once here
     db.refresh(db_user)
+    invalidate_cached_user(db_user.email)
+    invalidate_cached_slug(db_user.scheduling_slug)
     
     return db_user
 
 
-def authenticate_user(db: Session, email: str, password: str):
-    user = get_user_by_email(db, email)
-    if not user:
-        return None
-    if not user.is_verified:
-        return None  # Require email verification for standard users
-    if not verify_password(password, user.hashed_password):
-        return None
-    return user
+@functools.lru_cache(maxsize=1)
+def _dummy_password_hash() -> str:
+    """Hash checked when there is no real one, so every login pays the same bcrypt cost."""
+    return get_password_hash(secrets.token_urlsafe(16))
+
+
+# Recently verified logins, so a client retrying with the same credentials doesn't
+# pay for bcrypt again. Keys are peppered HMACs, never plain passwords; entries
+# are tied to the stored hash so a password change invalidates them.
+AUTH_CACHE_TTL = 30  # seconds
+AUTH_CACHE_MAX_SIZE = 50_000
+_auth_cache: Dict[bytes, Tuple[str, float]] = {}  # credential key -> (hashed_password, monotonic deadline)
+_auth_cache_lock = threading.Lock()
+
+
+def _auth_cache_key(email: str, password: str) -> bytes:
+    return hmac.new(settings.SECRET_KEY.encode(), f"{email}:{password}".encode(), hashlib.sha256).digest()
+
+
+def _is_recently_authenticated(key: bytes, hashed_password: str) -> bool:
+    with _auth_cache_lock:
+        cached = _auth_cache.get(key)
+    return (
+        cached is not None
+        and time.monotonic() < cached[1]
+        and hmac.compare_digest(cached[0], hashed_password)
+    )
+
+
+def _remember_authentication(key: bytes, hashed_password: str) -> None:
+    with _auth_cache_lock:
+        if len(_auth_cache) >= AUTH_CACHE_MAX_SIZE:
+            _auth_cache.pop(next(iter(_auth_cache)))  # Drop the oldest entry
+        _auth_cache[key] = (hashed_password, time.monotonic() + AUTH_CACHE_TTL)
+
+
+async def authenticate_user(db: Session, email: str, password: str):
+    # A cache miss queries the database; keep that off the event loop too
+    record = await asyncio.to_thread(_get_cached_login_record, db, email)
+    
+    # Same credentials verified moments ago - skip bcrypt
+    auth_key = _auth_cache_key(email, password)
+    if not (record and record.hashed_password and record.is_verified
+            and _is_recently_authenticated(auth_key, record.hashed_password)):
+        # Always run one bcrypt verify, even for unknown emails or password-less
+        # (Google) accounts, so response time doesn't reveal which emails exist
+        hashed_password = record.hashed_password if record and record.hashed_password else _dummy_password_hash()
+        password_ok = await asyncio.to_thread(verify_password, password, hashed_password)
+        
+        if not record or not record.hashed_password or not password_ok:
+            return None
+        if not record.is_verified:
+            return None  # Require email verification for standard users
+        _remember_authentication(auth_key, record.hashed_password)
+    
+    # Load the full user in the caller's session
+    return await asyncio.to_thread(db.get, User, record.id)
 
 
 def verify_user_email(db: Session, token: str):
@@ -90,5 +245,6 @@ def verify_user_email(db: Session, token: str):
         user.is_verified = True
         user.verification_token = None
         db.commit()
+        invalidate_cached_user(user.email)
         return user
     return None
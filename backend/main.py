@@ -1,31 +1,34 @@
+import logging
 import os
 from pathlib import Path
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 import asyncio
 
-# Load environment variables from .env file if it exists
+# Load environment variables from .env file if it exists. Variables already set in
+# the environment win, matching how Settings reads the same file, and quoted
+# values are unquoted the same way so os.getenv() and settings agree.
 env_file = Path(".env")
 if env_file.exists():
-    with open(env_file, "r") as f:
-        for line in f:
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                key, value = line.split("=", 1)
-                os.environ[key] = value
+    for line in env_file.read_text().splitlines():
+        line = line.strip()
+        if line and not line.startswith("#") and "=" in line:
+            key, value = (part.strip() for part in line.split("=", 1))
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+                value = value[1:-1]
+            os.environ.setdefault(key, value)
 
 from app.api.v1.api import api_router
 from app.core.config import settings
-from app.core.database import Base, engine
-
-# Create database tables (only create if they don't exist)
-Base.metadata.create_all(bind=engine)  # Create all tables with updated schema
+from app.core.database import init_db
 
 # Import background sync service
 from app.services.sync.background_sync import background_sync_service
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
     description="AI-powered appointment scheduling agent",
@@ -62,11 +65,16 @@ app.include_router(web_router)
 app.include_router(public_scheduling_router)
 
 # Templates for HTML responses
-templates = Jinja2Templates(directory="app/templates")
+from app.core.templates import templates
 
 @app.on_event("startup")
 async def startup_event():
     """Start background sync service on application startup"""
+    logger.info("Event loop: %s", type(asyncio.get_running_loop()).__module__)
+    if settings.CREATE_TABLES_ON_STARTUP:
+        # Done here rather than at import time, so importing the app (tests, scripts,
+        # extra workers with this disabled) doesn't hit the database
+        await asyncio.to_thread(init_db)
     print("[STARTUP] Starting background sync service...")
     try:
         # Start background sync in a separate task
@@ -75,9 +83,21 @@ async def startup_event():
     except Exception as e:
         print(f"[STARTUP ERROR] Failed to start background sync service: {e}")
 
+def _wants_json_error(request: Request) -> bool:
+    """True for API, fetch/XHR and htmx callers that only need an error signal."""
+    headers = request.headers
+    return (
+        "/api/" in request.url.path
+        or headers.get("hx-request") == "true"
+        or "application/json" in headers.get("accept", "")
+    )
+
 @app.exception_handler(500)
 async def internal_error_handler(request: Request, exc):
     """Handle 500 errors"""
+    if _wants_json_error(request):
+        # Skip the Jinja render for callers that never display the error page
+        return JSONResponse({"success": False, "message": "Internal server error"}, status_code=500)
     return templates.TemplateResponse(
         "500.html", 
         {"request": request}, 
@@ -86,5 +106,11 @@ async def internal_error_handler(request: Request, exc):
 
 if __name__ == "__main__":
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000)
+    # uvloop ships with uvicorn[standard]; fall back to asyncio where it is unavailable (e.g. Windows)
+    try:
+        import uvloop  # noqa: F401
+        loop = "uvloop"
+    except ImportError:
+        loop = "asyncio"
+    uvicorn.run(app, host="0.0.0.0", port=8000, loop=loop)
 
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+# Settings are read at import time; point the app's own engine at a scratch file
+# so importing app modules never touches a real database
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import init_db
+from app.models.models import User
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool
+    )
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    init_db(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def user(db):
+    user = User(
+        email="host@example.com",
+        full_name="Host",
+        hashed_password="hashed",
+        scheduling_slug="host-1",
+        is_active=True,
+        is_verified=True,
+        timezone="UTC",
+    )
+    db.add(user)
+    db.commit()
+    return user
@@ -0,0 +1,96 @@
+from datetime import datetime, timedelta, timezone
+
+from app.models.models import AvailabilitySlot
+from app.services import availability_service
+from app.services.availability_service import (
+    create_availability_slots_bulk,
+    create_availability_slots_from_calendar,
+)
+
+
+def _slot_starts(db, user_id):
+    slots = db.query(AvailabilitySlot).filter(AvailabilitySlot.user_id == user_id).all()
+    return {slot.id: slot.start_time.replace(tzinfo=timezone.utc) for slot in slots}
+
+
+def test_bulk_create_pairs_returned_ids_with_their_rows(db, user):
+    result = create_availability_slots_bulk(db, user.id, [
+        {"date": "2030-01-01", "start_time": "11:00"},
+        {"date": "2030-01-01", "start_time": "09:00", "period": 60},
+        {"date": "2030-01-01", "start_time": "10:00"},
+    ])
+
+    assert result["success"], result
+    assert result["slots_created"] == 3
+    stored = _slot_starts(db, user.id)
+    for slot in result["created_slots"]:
+        assert datetime.fromisoformat(slot["start_time"]) == stored[slot["id"]]
+    nine = next(slot for slot in result["created_slots"] if slot["start_time"].startswith("2030-01-01T09:00"))
+    assert datetime.fromisoformat(nine["end_time"]) - datetime.fromisoformat(nine["start_time"]) == timedelta(hours=1)
+
+
+def test_bulk_create_reports_conflicting_rows_as_existing(db, user):
+    create_availability_slots_bulk(db, user.id, [{"date": "2030-01-01", "start_time": "09:00"}])
+
+    result = create_availability_slots_bulk(db, user.id, [
+        {"date": "2030-01-01", "start_time": "09:00"},
+        {"date": "2030-01-01", "start_time": "10:00"},
+        {"date": "2030-01-01", "start_time": "10:00"},
+        {"date": "2030-01-01", "start_time": "11:00"},
+    ])
+
+    assert result["success"], result
+    assert result["slots_created"] == 2
+    # One found up front, one repeat within the batch dropped by the conflict
+    assert len(result["existing_slots"]) == 2
+    assert len(_slot_starts(db, user.id)) == 3
+
+
+def test_bulk_create_counts_rows_inserted_concurrently(monkeypatch, db, user):
+    create_availability_slots_bulk(db, user.id, [{"date": "2030-01-01", "start_time": "09:00"}])
+    slots_starting_at = availability_service._slots_starting_at
+    lookups = []
+
+    def miss_first_lookup(db, user_id, start_times):
+        # Simulates another request inserting the slot after the up-front lookup
+        lookups.append(start_times)
+        return [] if len(lookups) == 1 else slots_starting_at(db, user_id, start_times)
+
+    monkeypatch.setattr(availability_service, "_slots_starting_at", miss_first_lookup)
+
+    result = create_availability_slots_bulk(db, user.id, [
+        {"date": "2030-01-01", "start_time": "09:00"},
+        {"date": "2030-01-01", "start_time": "10:00"},
+    ])
+
+    assert result["success"], result
+    assert result["slots_created"] == 1
+    assert [slot["start_time"][:16] for slot in result["existing_slots"]] == ["2030-01-01T09:00"]
+    assert result["created_slots"][0]["start_time"].startswith("2030-01-01T10:00")
+
+
+def test_calendar_slots_skip_existing_starts(monkeypatch, db, user):
+    day = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+    class FakeCalendarService:
+        def __init__(self, **kwargs):
+            pass
+
+        def get_busy_intervals(self, start, end):
+            return []
+
+        def get_available_slots(self, date, busy_intervals=None):
+            return [
+                {"start_time": day + timedelta(hours=hour), "end_time": day + timedelta(hours=hour, minutes=30)}
+                for hour in (9, 10)
+            ]
+
+    monkeypatch.setattr(availability_service, "GoogleCalendarService", FakeCalendarService)
+    user.google_calendar_connected = True
+    create_availability_slots_bulk(db, user.id, [{"date": "2030-01-01", "start_time": "09:00"}])
+
+    created = create_availability_slots_from_calendar(db, user, day, day)
+
+    assert [slot.start_time.hour for slot in created] == [10]
+    assert create_availability_slots_from_calendar(db, user, day, day) == []
+    assert len(_slot_starts(db, user.id)) == 2
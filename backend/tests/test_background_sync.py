@@ -0,0 +1,122 @@
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+
+from app.models.models import AvailabilitySlot, Booking
+from app.services.sync import background_sync
+from app.services.sync.background_sync import BackgroundSyncService
+
+
+START = datetime(2030, 1, 1, 9, tzinfo=timezone.utc)
+END = datetime(2030, 1, 1, 9, 30, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def connected_user(db, user):
+    user.google_access_token = "access"
+    user.google_refresh_token = "refresh"
+    user.google_calendar_sync_token = "old-token"
+    slot = AvailabilitySlot(user_id=user.id, start_time=START, end_time=END, is_available=False)
+    db.add(slot)
+    db.flush()
+    for event_id in ("evt-1", "evt-2"):
+        db.add(Booking(
+            host_user_id=user.id, availability_slot_id=slot.id, guest_name="Guest",
+            guest_email="guest@example.com", start_time=START, end_time=END, google_event_id=event_id,
+        ))
+    db.commit()
+    return user
+
+
+def _stub_calendar(monkeypatch, changes):
+    class FakeCalendarService:
+        def __init__(self, **kwargs):
+            pass
+
+        def get_events_incremental(self, sync_token, start_date, end_date):
+            return changes
+
+    monkeypatch.setattr(background_sync, "GoogleCalendarService", FakeCalendarService)
+
+
+def _sync_service(monkeypatch):
+    service = BackgroundSyncService()
+    # SQLite hands back naive datetimes; compare titles only
+    monkeypatch.setattr(service, "_has_event_changed", lambda booking, event: booking.guest_name != event["summary"])
+    return service
+
+
+def _event(event_id, summary):
+    return {
+        "id": event_id,
+        "summary": summary,
+        "start": {"dateTime": START.isoformat()},
+        "end": {"dateTime": END.isoformat()},
+    }
+
+
+def test_sync_token_advances_when_every_event_applies(monkeypatch, db, connected_user):
+    _stub_calendar(monkeypatch, {
+        "events": [_event("evt-1", "Renamed"), _event("evt-2", "Guest")],
+        "next_sync_token": "new-token",
+    })
+
+    result = asyncio.run(_sync_service(monkeypatch).sync_calendar_to_database(db, connected_user.id))
+
+    assert result["success"]
+    assert result["events_updated"] == 1
+    db.refresh(connected_user)
+    assert connected_user.google_calendar_sync_token == "new-token"
+
+
+def test_sync_token_kept_when_an_event_fails(monkeypatch, db, connected_user):
+    _stub_calendar(monkeypatch, {
+        "events": [_event("evt-1", "Renamed"), _event("evt-2", "Also renamed")],
+        "next_sync_token": "new-token",
+    })
+    service = _sync_service(monkeypatch)
+    apply_event = service._update_booking_from_calendar_event
+
+    def fail_second_event(booking, event):
+        if event["id"] == "evt-2":
+            raise RuntimeError("boom")
+        apply_event(booking, event)
+
+    monkeypatch.setattr(service, "_update_booking_from_calendar_event", fail_second_event)
+
+    result = asyncio.run(service.sync_calendar_to_database(db, connected_user.id))
+
+    assert result["success"]
+    assert result["events_updated"] == 1
+    db.refresh(connected_user)
+    assert connected_user.google_calendar_sync_token == "old-token"
+
+
+def test_sync_token_saved_when_nothing_changed(monkeypatch, db, connected_user):
+    _stub_calendar(monkeypatch, {"events": [], "next_sync_token": "new-token"})
+
+    result = asyncio.run(_sync_service(monkeypatch).sync_calendar_to_database(db, connected_user.id))
+
+    assert result["success"]
+    db.refresh(connected_user)
+    assert connected_user.google_calendar_sync_token == "new-token"
+
+
+def test_trigger_now_wakes_the_wait_from_a_worker_thread():
+    service = BackgroundSyncService()
+
+    async def wait_with_trigger():
+        service.is_running = True
+        service._loop = asyncio.get_running_loop()
+        waiter = asyncio.create_task(service._wait_for_next_cycle(60))
+        await asyncio.to_thread(service.trigger_now)
+        await asyncio.wait_for(waiter, timeout=1)
+
+    asyncio.run(wait_with_trigger())
+
+
+def test_trigger_now_is_a_no_op_when_not_running():
+    service = BackgroundSyncService()
+    service.trigger_now()
+    assert not service._wake_event.is_set()
@@ -0,0 +1,128 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import AvailabilitySlot, Booking
+from app.schemas.schemas import BookingUpdate
+from app.services import booking_service
+from app.services.booking_service import cancel_booking, update_booking
+
+
+START = datetime(2030, 1, 1, 9, tzinfo=timezone.utc)
+
+
+class RescheduleUpdate(BookingUpdate):
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+
+class FakeCalendarService:
+    """Records calendar calls; update_event raises patch_error when set."""
+
+    calls = []
+    patch_error = None
+
+    def __init__(self, **kwargs):
+        pass
+
+    def update_event(self, event_id, start_time, end_time):
+        self.calls.append(("update", event_id))
+        if self.patch_error is not None:
+            raise self.patch_error
+        return {"id": event_id}
+
+    def create_booking_event(self, **kwargs):
+        self.calls.append(("create", kwargs["title"]))
+        return {"id": "evt-new"}
+
+    def delete_event(self, event_id):
+        self.calls.append(("delete", event_id))
+        return True
+
+
+@pytest.fixture
+def calendar(monkeypatch):
+    monkeypatch.setattr(booking_service, "GoogleCalendarService", FakeCalendarService)
+    monkeypatch.setattr(FakeCalendarService, "calls", [])
+    return FakeCalendarService
+
+
+@pytest.fixture
+def booking(db, user):
+    user.google_access_token = "access"
+    user.google_refresh_token = "refresh"
+    slot = AvailabilitySlot(user_id=user.id, start_time=START, end_time=START + timedelta(minutes=30), is_available=False)
+    db.add(slot)
+    db.flush()
+    booking = Booking(
+        host_user_id=user.id, availability_slot_id=slot.id, guest_name="Guest", guest_email="guest@example.com",
+        start_time=START, end_time=START + timedelta(minutes=30), google_event_id="evt-1",
+    )
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def _http_error(status):
+    return HttpError(httplib2.Response({"status": status}), b"")
+
+
+def _reschedule(db, booking, user):
+    new_start = START + timedelta(hours=2)
+    return update_booking(
+        db, booking.id, RescheduleUpdate(start_time=new_start, end_time=new_start + timedelta(minutes=30)), user.id
+    )
+
+
+def test_reschedule_patches_the_event(db, user, booking, calendar):
+    updated = _reschedule(db, booking, user)
+
+    assert calendar.calls == [("update", "evt-1")]
+    assert updated.google_event_id == "evt-1"
+
+
+def test_reschedule_recreates_a_missing_event(monkeypatch, db, user, booking, calendar):
+    monkeypatch.setattr(calendar, "patch_error", _http_error(404))
+
+    updated = _reschedule(db, booking, user)
+
+    assert calendar.calls == [("update", "evt-1"), ("create", "Meeting with Guest")]
+    assert updated.google_event_id == "evt-new"
+
+
+def test_reschedule_keeps_the_event_on_other_errors(monkeypatch, db, user, booking, calendar):
+    monkeypatch.setattr(calendar, "patch_error", _http_error(500))
+
+    updated = _reschedule(db, booking, user)
+
+    assert calendar.calls == [("update", "evt-1")]
+    assert updated.google_event_id == "evt-1"
+    assert updated.start_time.hour == 11  # The booking change is still saved
+
+
+def test_cancel_commits_then_deletes_the_event_in_the_background(monkeypatch, engine, db, user, booking, calendar):
+    submitted = []
+    monkeypatch.setattr(booking_service._background_executor, "submit", lambda fn, *args: submitted.append((fn, args)))
+    monkeypatch.setattr(booking_service, "SessionLocal", sessionmaker(bind=engine))
+
+    cancelled = cancel_booking(db, booking.id, user.id)
+
+    assert cancelled.status == "cancelled"
+    assert not calendar.calls  # Nothing on the request path
+    (fn, args), = submitted
+    fn(*args)
+    assert calendar.calls == [("delete", "evt-1")]
+
+
+def test_cancel_without_event_schedules_nothing(monkeypatch, db, user, booking):
+    submitted = []
+    monkeypatch.setattr(booking_service._background_executor, "submit", lambda fn, *args: submitted.append(fn))
+    booking.google_event_id = None
+    db.commit()
+
+    assert cancel_booking(db, booking.id, user.id).status == "cancelled"
+    assert not submitted
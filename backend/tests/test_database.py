@@ -0,0 +1,67 @@
+from sqlalchemy import inspect, text
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, init_db
+import app.models.models  # noqa: F401  (registers the models on Base.metadata)
+from app.services.availability_service import create_availability_slots_bulk
+
+
+# Turns a current schema into the one older releases created: no sync-token or
+# webhook-hash columns, and a plain (non-unique) per-user start time index
+DOWNGRADE = """
+DROP INDEX uq_availability_slots_user_start;
+CREATE INDEX ix_availability_slots_user_start ON availability_slots (user_id, start_time);
+ALTER TABLE users DROP COLUMN google_calendar_sync_token;
+ALTER TABLE bookings DROP COLUMN last_webhook_hash;
+INSERT INTO users (id, email, full_name, hashed_password, is_active, is_verified, scheduling_slug, timezone)
+    VALUES (1, 'host@example.com', 'Host', 'hashed', 1, 1, 'host-1', 'UTC');
+INSERT INTO availability_slots (id, user_id, start_time, end_time, is_available) VALUES
+    (1, 1, '2030-01-01 09:00:00.000000', '2030-01-01 09:30:00.000000', 1),
+    (2, 1, '2030-01-01 09:00:00.000000', '2030-01-01 09:30:00.000000', 0),
+    (3, 1, '2030-01-01 10:00:00.000000', '2030-01-01 10:30:00.000000', 1);
+INSERT INTO bookings (id, host_user_id, availability_slot_id, guest_name, guest_email, start_time, end_time, status)
+    VALUES (1, 1, 2, 'Guest', 'guest@example.com', '2030-01-01 09:00:00.000000', '2030-01-01 09:30:00.000000', 'confirmed')
+"""
+
+
+def _create_old_schema(engine):
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        for statement in DOWNGRADE.split(";"):
+            connection.execute(text(statement))
+
+
+def test_init_db_upgrades_existing_tables(engine):
+    _create_old_schema(engine)
+
+    init_db(engine)
+    init_db(engine)  # Idempotent
+
+    inspector = inspect(engine)
+    assert "google_calendar_sync_token" in {c["name"] for c in inspector.get_columns("users")}
+    assert "last_webhook_hash" in {c["name"] for c in inspector.get_columns("bookings")}
+    indexes = {index["name"]: index for index in inspector.get_indexes("availability_slots")}
+    assert "ix_availability_slots_user_start" not in indexes
+    assert indexes["uq_availability_slots_user_start"]["unique"]
+
+    with engine.connect() as connection:
+        slots = connection.execute(text("SELECT id, is_available FROM availability_slots ORDER BY id")).all()
+        booking_slot = connection.execute(text("SELECT availability_slot_id FROM bookings")).scalar()
+    # The duplicate merges into the lowest id, keeping its booking and booked state
+    assert [(slot_id, bool(available)) for slot_id, available in slots] == [(1, False), (3, True)]
+    assert booking_slot == 1
+
+
+def test_bulk_create_works_on_upgraded_table(engine):
+    _create_old_schema(engine)
+    init_db(engine)
+    db = sessionmaker(bind=engine)()
+
+    result = create_availability_slots_bulk(db, 1, [
+        {"date": "2030-01-01", "start_time": "09:00"},
+        {"date": "2030-01-01", "start_time": "11:00"},
+    ])
+
+    assert result["success"], result
+    assert result["slots_created"] == 1
+    assert len(result["existing_slots"]) == 1
@@ -0,0 +1,43 @@
+import time
+from datetime import timedelta
+
+import pytest
+
+from app.api import deps
+from app.core.security import create_access_token
+
+
+@pytest.fixture(autouse=True)
+def clear_user_id_cache():
+    deps._user_id_cache.clear()
+    yield
+    deps._user_id_cache.clear()
+
+
+def test_known_token_skips_verification(monkeypatch, db, user):
+    token = create_access_token({"sub": user.email})
+
+    assert deps._get_user_for_token(db, token) is user
+    # Keyed by a digest of the token, never the token itself
+    assert token.encode() not in deps._user_id_cache
+    assert [user_id for user_id, _ in deps._user_id_cache.values()] == [user.id]
+
+    monkeypatch.setattr(deps, "verify_token", lambda token: pytest.fail("token verified again"))
+    assert deps._get_user_for_token(db, token) is user
+
+
+def test_cached_entry_ends_with_the_token(db, user):
+    token = create_access_token({"sub": user.email}, expires_delta=timedelta(seconds=5))
+
+    deps._get_user_for_token(db, token)
+
+    (_, deadline), = deps._user_id_cache.values()
+    assert deadline <= time.monotonic() + 5
+
+
+def test_unknown_user_is_not_cached(db, user):
+    token = create_access_token({"sub": "nobody@example.com"})
+
+    assert deps._get_user_for_token(db, token) is None
+    assert deps._get_user_for_token(db, "not-a-jwt") is None
+    assert not deps._user_id_cache
@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta, timezone
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+from app.services.google_calendar_service import FreeBusyError, GoogleCalendarService
+
+
+class FakeFreeBusy:
+    """Stands in for service.freebusy(), answering each query from a callback."""
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.queries = []
+
+    def freebusy(self):
+        return self
+
+    def query(self, body):
+        self.queries.append(body)
+        return self
+
+    def execute(self):
+        return self.respond(self.queries[-1])
+
+
+def _calendar_service(monkeypatch, respond):
+    fake = FakeFreeBusy(respond)
+    service = GoogleCalendarService()
+    monkeypatch.setattr(service, "_ensure_valid_credentials", lambda: None)
+    monkeypatch.setattr(service, "_get_service", lambda: fake)
+    return service, fake
+
+
+def _busy(start, end):
+    return {"calendars": {"primary": {"busy": [{"start": start, "end": end}]}}}
+
+
+START = datetime(2030, 1, 1, tzinfo=timezone.utc)
+
+
+def test_busy_intervals_split_long_ranges(monkeypatch):
+    service, fake = _calendar_service(monkeypatch, lambda body: {"calendars": {"primary": {"busy": []}}})
+
+    assert service.get_busy_intervals(START, START + timedelta(days=45)) == []
+
+    assert [(q["timeMin"], q["timeMax"]) for q in fake.queries] == [
+        (START.isoformat(), (START + timedelta(days=30)).isoformat()),
+        ((START + timedelta(days=30)).isoformat(), (START + timedelta(days=45)).isoformat()),
+    ]
+
+
+def test_calendar_errors_are_not_read_as_free(monkeypatch):
+    errors = {"calendars": {"primary": {"errors": [{"domain": "global", "reason": "backendError"}]}}}
+    service, _ = _calendar_service(monkeypatch, lambda body: errors)
+
+    with pytest.raises(FreeBusyError):
+        service.get_busy_intervals(START, START + timedelta(hours=1))
+    with pytest.raises(FreeBusyError):
+        service.check_availability(START, START + timedelta(hours=1))
+
+
+def test_check_availability_uses_busy_time(monkeypatch):
+    service, _ = _calendar_service(
+        monkeypatch, lambda body: _busy("2030-01-01T09:00:00+00:00", "2030-01-01T10:00:00+00:00")
+    )
+
+    assert not service.check_availability(START + timedelta(hours=9), START + timedelta(hours=10))
+
+
+def test_available_slots_skip_busy_time(monkeypatch):
+    busy = [(START + timedelta(hours=10), START + timedelta(hours=11))]
+    service, fake = _calendar_service(monkeypatch, lambda body: pytest.fail("freeBusy queried"))
+
+    slots = service.get_available_slots(START, busy_intervals=busy)
+
+    assert slots
+    assert not fake.queries
+    for slot in slots:
+        assert slot["end_time"] <= busy[0][0] or slot["start_time"] >= busy[0][1]
+
+
+class FakeEvents:
+    """Stands in for service.events(), rejecting any sync token in expired_tokens."""
+
+    def __init__(self, expired_tokens=()):
+        self.expired_tokens = set(expired_tokens)
+        self.requests = []
+
+    def events(self):
+        return self
+
+    def list(self, **params):
+        self.requests.append(params)
+        return self
+
+    def execute(self):
+        params = self.requests[-1]
+        if params.get("syncToken") in self.expired_tokens:
+            raise HttpError(httplib2.Response({"status": 410}), b"Sync token is no longer valid")
+        return {"items": [{"id": "evt-1"}], "nextSyncToken": "next-token"}
+
+
+def _events_service(monkeypatch, fake):
+    service = GoogleCalendarService()
+    monkeypatch.setattr(service, "_ensure_valid_credentials", lambda: None)
+    monkeypatch.setattr(service, "_get_service", lambda: fake)
+    return service
+
+
+def test_incremental_sync_sends_only_the_token(monkeypatch):
+    fake = FakeEvents()
+    service = _events_service(monkeypatch, fake)
+
+    changes = service.get_events_incremental("old-token", START, START + timedelta(days=1))
+
+    assert changes == {"events": [{"id": "evt-1"}], "next_sync_token": "next-token"}
+    assert fake.requests[0]["syncToken"] == "old-token"
+    assert "timeMin" not in fake.requests[0]
+
+
+def test_expired_sync_token_falls_back_to_a_full_sync(monkeypatch):
+    fake = FakeEvents(expired_tokens={"old-token"})
+    service = _events_service(monkeypatch, fake)
+
+    changes = service.get_events_incremental("old-token", START, START + timedelta(days=1))
+
+    assert changes["next_sync_token"] == "next-token"
+    full_sync = fake.requests[-1]
+    assert "syncToken" not in full_sync
+    assert (full_sync["timeMin"], full_sync["timeMax"]) == (
+        START.isoformat(), (START + timedelta(days=1)).isoformat()
+    )
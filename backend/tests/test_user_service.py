@@ -0,0 +1,79 @@
+import asyncio
+
+import pytest
+from sqlalchemy import event
+
+from app.services import user_service
+from app.services.user_service import authenticate_user, invalidate_cached_user
+
+
+@pytest.fixture(autouse=True)
+def plain_passwords(monkeypatch):
+    """Compare passwords directly; bcrypt's cost isn't what these tests cover."""
+    checks = []
+
+    def verify_password(password, hashed_password):
+        checks.append(password)
+        return hashed_password == f"hashed:{password}"
+
+    monkeypatch.setattr(user_service, "verify_password", verify_password)
+    monkeypatch.setattr(user_service, "_dummy_password_hash", lambda: "hashed:")
+    user_service._login_record_cache.clear()
+    user_service._auth_cache.clear()
+    yield checks
+    user_service._login_record_cache.clear()
+    user_service._auth_cache.clear()
+
+
+@pytest.fixture
+def email_lookups(engine):
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "WHERE users.email" in statement:
+            statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record)
+
+
+def test_repeat_login_uses_cached_record(db, user, email_lookups, plain_passwords):
+    user.hashed_password = "hashed:secret"
+    db.commit()
+
+    assert asyncio.run(authenticate_user(db, user.email, "secret")) is user
+    assert asyncio.run(authenticate_user(db, user.email, "secret")) is user
+
+    assert len(email_lookups) == 1
+    assert plain_passwords == ["secret"]  # The retry skipped the password check too
+
+
+def test_wrong_password_and_unknown_email_are_rejected(db, user, plain_passwords):
+    user.hashed_password = "hashed:secret"
+    db.commit()
+
+    assert asyncio.run(authenticate_user(db, user.email, "wrong")) is None
+    assert asyncio.run(authenticate_user(db, "nobody@example.com", "secret")) is None
+    assert plain_passwords == ["wrong", "secret"]  # Unknown emails still pay for one check
+
+
+def test_invalidation_picks_up_a_password_change(db, user):
+    user.hashed_password = "hashed:secret"
+    db.commit()
+    assert asyncio.run(authenticate_user(db, user.email, "secret")) is user
+
+    user.hashed_password = "hashed:changed"
+    db.commit()
+    invalidate_cached_user(user.email)
+
+    assert asyncio.run(authenticate_user(db, user.email, "secret")) is None
+    assert asyncio.run(authenticate_user(db, user.email, "changed")) is user
+
+
+def test_unverified_user_cannot_log_in(db, user):
+    user.hashed_password = "hashed:secret"
+    user.is_verified = False
+    db.commit()
+
+    assert asyncio.run(authenticate_user(db, user.email, "secret")) is None